@@ -0,0 +1,359 @@
+"""Headless JSON API for the quadratic solver.
+
+Run it next to (or instead of) the Streamlit page:
+
+    python api.py --port 8000 --workers 4 --max-concurrency 256
+
+Endpoints:
+
+    GET  /health         liveness probe and cache statistics
+    POST /solve          {"a": "1", "b": "-5", "c": "6"}
+    POST /solve/batch    {"problems": [{"a": ..., "b": ..., "c": ...}, ...]}
+
+Pass ``"steps": false`` (per problem, or at the top level of a batch) to get
+only the roots, discriminant and factored form without the step list.
+
+The HTTP layer is a small asyncio server using only the standard library.
+Parsing and solving are CPU-bound, so they run in a bounded process pool
+that uses the same governor, solver and step model as the page. Single
+requests that arrive within a few milliseconds of each other are
+micro-batched, and identical problems in a batch are solved once. Within a
+batch, the plain-number problems (closed-form fast path) share one pool
+task, while every symbolic problem gets a task of its own, so a slow surd
+or transcendental input never holds cheap requests back.
+"""
+import argparse
+import asyncio
+import json
+import logging
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from fractions import Fraction
+from http import HTTPStatus
+
+from sympy import latex
+
+import governor
+import solver
+import steps
+
+logger = logging.getLogger("api")
+
+MAX_BODY_BYTES = 256 * 1024
+MAX_BATCH_PROBLEMS = 1000
+
+
+# ---------- solver side (runs in pool workers) ----------
+
+def _expr(value):
+    return {"value": str(value), "latex": latex(value)}
+
+
+def _factored(s):
+    roots = s.unique_roots
+    if len(roots) == 1:
+        return s.a * (solver.x - roots[0])**2
+    return s.a * (solver.x - roots[0]) * (solver.x - roots[1])
+
+
+def solve_payload(a_text, b_text, c_text, with_steps=True):
+    """Solve one problem from raw text and return its JSON-ready payload."""
+    try:
+        a, b, c = (governor.parse_coefficient(str(t)) for t in (a_text, b_text, c_text))
+        if a == 0:
+            raise ValueError("Coefficient 'a' cannot be zero for a quadratic equation!")
+        s = governor.solve(a, b, c)
+        sections = {
+            name: [{"kind": step.kind, "content": step.content} for step in steps.get_section(s, name)]
+            for name in steps.SECTIONS
+        } if with_steps else None
+    except governor.TooComplexError as e:
+        return {"error": {"type": "too_complex", "message": str(e)}}
+    except Exception as e:
+        return {"error": {"type": "invalid_input", "message": str(e)}}
+
+    discriminant = s.discriminant
+    if discriminant.is_zero:
+        kind = "repeated"
+    elif discriminant.is_positive:
+        kind = "real"
+    elif discriminant.is_negative:
+        kind = "complex"
+    else:
+        kind = "symbolic"
+    payload = {
+        "coefficients": {"a": _expr(s.a), "b": _expr(s.b), "c": _expr(s.c)},
+        "equation": {"value": f"{s.equation} = 0", "latex": f"{latex(s.equation)} = 0"},
+        "discriminant": _expr(discriminant),
+        "kind": kind,
+        "roots": [_expr(r) for r in s.unique_roots],
+        "factored": _expr(_factored(s)),
+        "answer_latex": steps.answer_latex(s),
+    }
+    if sections is not None:
+        payload["steps"] = sections
+    return payload
+
+
+def solve_many(problems):
+    """Solve a list of (a, b, c, with_steps) problems, solving duplicates only once."""
+    unique = {}
+    for problem in problems:
+        if problem not in unique:
+            unique[problem] = solve_payload(*problem)
+    return [unique[problem] for problem in problems]
+
+
+# ---------- server side ----------
+
+def _is_rational(problem):
+    """True if every coefficient is a plain number, which the solver answers in closed form."""
+    for text in problem[:3]:
+        # Same limits as the governor, so "1e999999" is not expanded here.
+        mantissa, _, exponent = text.strip().lower().partition("e")
+        if len(mantissa) > governor.MAX_LITERAL_DIGITS or len(exponent.lstrip("+-")) > 3:
+            return False
+        try:
+            Fraction(text.strip())
+        except (ValueError, ZeroDivisionError):
+            return False
+    return True
+
+
+def _groups(problems):
+    """Split batch positions into pool tasks: all rational problems together, each symbolic one alone."""
+    rational, symbolic = [], {}
+    for i, problem in enumerate(problems):
+        if _is_rational(problem):
+            rational.append(i)
+        else:
+            symbolic.setdefault(problem, []).append(i)
+    return ([rational] if rational else []) + list(symbolic.values())
+
+
+class MicroBatcher:
+    """Collect single solve requests for a short window and solve them together.
+
+    Each group from ``_groups`` is its own pool task and its requests are
+    answered as soon as that task finishes.
+    """
+
+    def __init__(self, pool, window, max_size):
+        self.pool = pool
+        self.window = window
+        self.max_size = max_size
+        self.queue = asyncio.Queue()
+        self.results = solver.SolutionCache(maxsize=4096)
+
+    async def submit(self, problem):
+        cached = self.results.get(problem)
+        if cached is not None:
+            return cached
+        future = asyncio.get_running_loop().create_future()
+        await self.queue.put((problem, future))
+        return await future
+
+    async def _solve_group(self, problems):
+        loop = asyncio.get_running_loop()
+        results = await loop.run_in_executor(self.pool, solve_many, problems)
+        for problem, result in zip(problems, results):
+            if "error" not in result:
+                self.results.put(problem, result)
+        return results
+
+    async def solve_batch(self, problems):
+        results = [None] * len(problems)
+
+        async def run(indices):
+            for i, result in zip(indices, await self._solve_group([problems[i] for i in indices])):
+                results[i] = result
+
+        await asyncio.gather(*(run(indices) for indices in _groups(problems)))
+        return results
+
+    async def run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self.queue.get()]
+            deadline = loop.time() + self.window
+            while len(batch) < self.max_size:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self.queue.get(), remaining))
+                except asyncio.TimeoutError:
+                    break
+            asyncio.create_task(self._dispatch(batch))
+
+    async def _dispatch(self, batch):
+        groups = _groups([problem for problem, _ in batch])
+        await asyncio.gather(*(self._dispatch_group([batch[i] for i in indices]) for indices in groups))
+
+    async def _dispatch_group(self, batch):
+        try:
+            results = await self._solve_group([problem for problem, _ in batch])
+        except Exception as e:
+            logger.exception("Solve batch failed")
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        for (_, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
+
+
+def _flag(value):
+    # bool("false") is True, so only real JSON booleans are accepted.
+    if not isinstance(value, bool):
+        raise TypeError("steps must be true or false")
+    return value
+
+
+def _problem(item, with_steps=True):
+    if isinstance(item, dict):
+        return (str(item["a"]), str(item["b"]), str(item["c"]), _flag(item.get("steps", with_steps)))
+    a, b, c = item
+    return (str(a), str(b), str(c), with_steps)
+
+
+class SolveServer:
+    def __init__(self, pool, max_concurrency, batch_window, batch_size):
+        self.pool = pool
+        self.batcher = MicroBatcher(pool, batch_window, batch_size)
+        self.limit = asyncio.Semaphore(max_concurrency)
+
+    async def route(self, method, path, body):
+        if path == "/health":
+            if method != "GET":
+                return HTTPStatus.METHOD_NOT_ALLOWED, {"error": "Use GET."}
+            return HTTPStatus.OK, {"status": "ok", "cache": self.batcher.results.stats()}
+        if path not in ("/solve", "/solve/batch"):
+            return HTTPStatus.NOT_FOUND, {"error": f"No route for {path}."}
+        if method != "POST":
+            return HTTPStatus.METHOD_NOT_ALLOWED, {"error": "Use POST."}
+
+        try:
+            data = json.loads(body or b"{}")
+            if path == "/solve":
+                problems = [_problem(data)]
+            else:
+                if not isinstance(data, dict) or not isinstance(data.get("problems"), list):
+                    raise TypeError("expected an object with a list of problems")
+                with_steps = _flag(data.get("steps", True))
+                problems = [_problem(item, with_steps) for item in data["problems"]]
+        except (ValueError, KeyError, TypeError, AttributeError):
+            return HTTPStatus.BAD_REQUEST, {"error": "Expected JSON with coefficients a, b and c and an optional boolean steps."}
+        if len(problems) > MAX_BATCH_PROBLEMS:
+            return HTTPStatus.REQUEST_ENTITY_TOO_LARGE, {"error": f"At most {MAX_BATCH_PROBLEMS} problems per batch."}
+
+        async with self.limit:
+            if path == "/solve":
+                result = await self.batcher.submit(problems[0])
+                status = HTTPStatus.UNPROCESSABLE_ENTITY if "error" in result else HTTPStatus.OK
+                return status, result
+            return HTTPStatus.OK, {"results": await self.batcher.solve_batch(problems)}
+
+    async def handle(self, reader, writer):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                try:
+                    method, path, version = request_line.decode("latin-1").split()
+                except ValueError:
+                    await self._respond(writer, HTTPStatus.BAD_REQUEST, {"error": "Malformed request line."}, False)
+                    break
+
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+
+                try:
+                    length = int(headers.get("content-length", 0) or 0)
+                    if length < 0:
+                        raise ValueError(length)
+                except ValueError:
+                    await self._respond(writer, HTTPStatus.BAD_REQUEST, {"error": "Invalid Content-Length."}, False)
+                    break
+                keep_alive = headers.get("connection", "").lower() != "close" and version == "HTTP/1.1"
+                if length > MAX_BODY_BYTES:
+                    await self._respond(writer, HTTPStatus.REQUEST_ENTITY_TOO_LARGE, {"error": "Request body is too large."}, False)
+                    break
+                body = await reader.readexactly(length) if length else b""
+
+                try:
+                    status, payload = await self.route(method, path.split("?", 1)[0], body)
+                except Exception:
+                    logger.exception("Unhandled error for %s %s", method, path)
+                    status, payload = HTTPStatus.INTERNAL_SERVER_ERROR, {"error": "Internal server error."}
+                await self._respond(writer, status, payload, keep_alive)
+                if not keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    async def _respond(self, writer, status, payload, keep_alive):
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        head = (
+            f"HTTP/1.1 {status.value} {status.phrase}\r\n"
+            "Content-Type: application/json; charset=utf-8\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+        )
+        writer.write(head.encode("latin-1") + body)
+        await writer.drain()
+
+
+async def serve(host, port, workers, max_concurrency, batch_window, batch_size):
+    # Workers are started on demand. Forked from this process, they would
+    # inherit the open client sockets and keep "Connection: close" replies
+    # from ever reaching EOF, so they come from a clean fork server instead.
+    method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+    context = multiprocessing.get_context(method)
+    if method == "forkserver":
+        context.set_forkserver_preload(["governor", "solver", "steps"])
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+        app = SolveServer(pool, max_concurrency, batch_window, batch_size)
+        batcher = asyncio.create_task(app.batcher.run())
+        server = await asyncio.start_server(app.handle, host, port, backlog=1024)
+        logger.info("Serving on http://%s:%d with %d workers", host, port, workers)
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            batcher.cancel()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Headless JSON API for the quadratic solver.")
+    parser.add_argument("--host", default=os.environ.get("SOLVER_API_HOST", "127.0.0.1"))
+    parser.add_argument("--port", type=int, default=int(os.environ.get("SOLVER_API_PORT", 8000)))
+    parser.add_argument("--workers", type=int, default=int(os.environ.get("SOLVER_API_WORKERS", os.cpu_count() or 1)),
+                        help="size of the process pool doing the CPU-bound solving")
+    parser.add_argument("--max-concurrency", type=int, default=int(os.environ.get("SOLVER_API_CONCURRENCY", 256)),
+                        help="requests solved at the same time; the rest wait their turn")
+    parser.add_argument("--batch-window-ms", type=float, default=2.0,
+                        help="how long to collect single requests into one pool task")
+    parser.add_argument("--batch-size", type=int, default=64, help="largest micro-batch sent to one worker")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    try:
+        asyncio.run(serve(args.host, args.port, args.workers, args.max_concurrency,
+                          args.batch_window_ms / 1000, args.batch_size))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""Page images, resized and compressed once and served as static files.
+
+``logo.png`` is a 688×686 PNG of about 550 KB that the header shows 150 px
+wide. ``st.image`` re-encoded and resent it on every script run. Instead,
+the first run in a worker writes WebP variants at 1x and 2x the display
+width into ``static/``. Streamlit serves that folder at ``app/static/``
+(``server.enableStaticServing`` in ``.streamlit/config.toml``). The page
+only holds an ``<img>`` tag pointing there, so the browser downloads the
+roughly 6 KB file once and caches it.
+
+Variants are rebuilt only when the source image is newer than them.
+"""
+import functools
+import logging
+import os
+import threading
+
+logger = logging.getLogger(__name__)
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+STATIC_DIR = os.path.join(HERE, "static")
+STATIC_URL = "app/static"
+WEBP_QUALITY = 85
+
+_lock = threading.Lock()
+
+
+def _variant(source, width):
+    """Write ``source`` resized to ``width`` px into ``static/`` and return its file name."""
+    from PIL import Image  # only needed when a variant is (re)built
+
+    stem = os.path.splitext(os.path.basename(source))[0]
+    name = f"{stem}-{width}.webp"
+    target = os.path.join(STATIC_DIR, name)
+    if os.path.exists(target) and os.path.getmtime(target) >= os.path.getmtime(source):
+        return name
+    with Image.open(source) as image:
+        height = round(image.height * width / image.width)
+        resized = image.resize((width, height), Image.LANCZOS)
+    os.makedirs(STATIC_DIR, exist_ok=True)
+    # Write-then-rename so a concurrent request never serves a partial file.
+    tmp = f"{target}.{os.getpid()}.tmp"
+    resized.save(tmp, "WEBP", quality=WEBP_QUALITY, method=6)
+    os.replace(tmp, target)
+    return name
+
+
+@functools.cache
+def image_tag(filename, width, alt=""):
+    """``<img>`` tag for a static, right-sized copy of ``filename``, or "" if it cannot be built."""
+    source = os.path.join(HERE, filename)
+    try:
+        with _lock:
+            small, large = _variant(source, width), _variant(source, 2 * width)
+    except Exception as e:
+        logger.warning("Could not prepare %s for static serving: %s", filename, e)
+        return ""
+    return (f'<img src="{STATIC_URL}/{small}" srcset="{STATIC_URL}/{small} 1x, {STATIC_URL}/{large} 2x" '
+            f'width="{width}" alt="{alt}">')
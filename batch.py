@@ -0,0 +1,280 @@
+"""Bulk worksheet mode: solve many coefficient triples from one upload.
+
+Rows whose coefficients are plain numbers are classified in one vectorized
+NumPy pass and solved in-process from the closed form in
+``solver.surd_roots``, without building any sympy objects. Only rows that
+need real symbolic work (surds, symbols, complex numbers) leave the process:
+they are solved in chunks by budgeted child processes from ``governor``, so
+the Streamlit worker never runs sympy.solve for them itself and a hostile
+row cannot stall the batch.
+"""
+import csv
+import io
+import json
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from fractions import Fraction
+
+import numpy as np
+from sympy import latex
+
+import governor
+import solver
+
+CHUNK_SIZE = 64
+MAX_ROWS = 20000
+# Relative size below which a float discriminant is rechecked exactly.
+DISC_TOLERANCE = 1e-9
+FIELDS = ["row", "a", "b", "c", "kind", "discriminant", "roots", "roots_latex", "error"]
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def read_problems(data, filename=""):
+    """Parse an uploaded CSV or JSONL file into a list of (a, b, c) strings.
+
+    CSV files may have an ``a,b,c`` header row; JSONL lines may be objects
+    with ``a``/``b``/``c`` keys or three-element arrays.
+    """
+    text = data.decode("utf-8-sig") if isinstance(data, bytes) else data
+    if filename.lower().endswith((".jsonl", ".ndjson", ".json")):
+        rows = []
+        for line in text.splitlines():
+            line = line.strip()
+            if not line:
+                continue
+            item = json.loads(line)
+            if isinstance(item, dict):
+                item = [item["a"], item["b"], item["c"]]
+            rows.append(tuple(str(v).strip() for v in item[:3]))
+    else:
+        reader = csv.reader(io.StringIO(text))
+        rows = [tuple(cell.strip() for cell in r[:3]) for r in reader if any(cell.strip() for cell in r)]
+        if rows and [cell.lower() for cell in rows[0]] == ["a", "b", "c"]:
+            rows = rows[1:]
+
+    for i, row in enumerate(rows, 1):
+        if len(row) != 3:
+            raise ValueError(f"Row {i} does not have three coefficients: {row}")
+    if len(rows) > MAX_ROWS:
+        raise ValueError(f"Worksheets are limited to {MAX_ROWS} rows (got {len(rows)}).")
+    return rows
+
+
+def _as_fraction(text):
+    # Fraction("1e999999999") would build the integer; leave such rows to
+    # the governor's limits instead.
+    mantissa, _, exponent = text.lower().partition("e")
+    if len(mantissa) > governor.MAX_LITERAL_DIGITS or len(exponent.lstrip("+-")) > 3:
+        return None
+    try:
+        return Fraction(text)
+    except (ValueError, ZeroDivisionError):
+        return None
+
+
+def classify(rows):
+    """Classify every row at once by the sign of its discriminant.
+
+    Returns ``(kinds, exact)`` where ``kinds`` is an array of "real",
+    "repeated", "complex", "linear" or "symbolic" and ``exact`` holds the
+    ``Fraction`` coefficients of the numeric rows (``None`` elsewhere).
+
+    The float pass only settles rows whose discriminant is clearly away from
+    zero; the rest, including coefficients that under- or overflow a float,
+    are decided from the exact ``Fraction`` discriminant.
+    """
+    exact = []
+    numeric = np.zeros(len(rows), dtype=bool)
+    linear = np.zeros(len(rows), dtype=bool)
+    coeffs = np.zeros((len(rows), 3), dtype=np.float64)
+    for i, row in enumerate(rows):
+        fractions = [_as_fraction(v) for v in row]
+        if None in fractions:
+            exact.append(None)
+            continue
+        exact.append(fractions)
+        numeric[i] = True
+        linear[i] = fractions[0] == 0
+        try:
+            coeffs[i] = [float(f) for f in fractions]
+        except OverflowError:
+            coeffs[i] = np.nan  # left to the exact check below
+
+    a, b, c = coeffs[:, 0], coeffs[:, 1], coeffs[:, 2]
+    with np.errstate(over="ignore", invalid="ignore"):
+        disc = b * b - 4.0 * a * c
+        # Rounding error in disc is a few ulps of the terms it is made of.
+        clear = np.abs(disc) > DISC_TOLERANCE * (b * b + np.abs(4.0 * a * c))
+    settled = numeric & ~linear & clear
+    kinds = np.full(len(rows), "symbolic", dtype=object)
+    kinds[settled & (disc > 0)] = "real"
+    kinds[settled & (disc < 0)] = "complex"
+    kinds[linear] = "linear"
+    for i in np.flatnonzero(numeric & ~linear & ~clear):
+        fa, fb, fc = exact[i]
+        exact_disc = fb * fb - 4 * fa * fc
+        kinds[i] = "repeated" if exact_disc == 0 else "real" if exact_disc > 0 else "complex"
+    return kinds, exact
+
+
+def _kind_of(discriminant):
+    if discriminant.is_zero:
+        return "repeated"
+    if discriminant.is_positive:
+        return "real"
+    if discriminant.is_negative:
+        return "complex"
+    return "symbolic"
+
+
+def _result(index, texts, solution=None, error=None):
+    row = {"row": index + 1, "a": texts[0], "b": texts[1], "c": texts[2]}
+    if error is not None:
+        row.update(kind="error", discriminant="", roots="", roots_latex="", error=error)
+        return row
+    row.update(
+        kind=_kind_of(solution.discriminant),
+        discriminant=str(solution.discriminant),
+        roots=", ".join(str(r) for r in solution.unique_roots),
+        roots_latex=", ".join(latex(r) for r in solution.unique_roots),
+        error="",
+    )
+    return row
+
+
+def _frac_latex(f):
+    if f.denominator == 1:
+        return str(f.numerator)
+    sign = "- " if f < 0 else ""
+    return f"{sign}\\frac{{{abs(f.numerator)}}}{{{f.denominator}}}"
+
+
+def _surd_text(coeff, radicand):
+    factors = [] if coeff.numerator == 1 else [str(coeff.numerator)]
+    if abs(radicand) != 1:
+        factors.append(f"sqrt({abs(radicand)})")
+    if radicand < 0:
+        factors.append("I")
+    text = "*".join(factors) or "1"
+    return text if coeff.denominator == 1 else f"{text}/{coeff.denominator}"
+
+
+def _surd_latex(coeff, radicand):
+    factors = [] if coeff.numerator == 1 else [str(coeff.numerator)]
+    if abs(radicand) != 1:
+        factors.append(f"\\sqrt{{{abs(radicand)}}}")
+    if radicand < 0:
+        factors.append("i")
+    text = " ".join(factors) or "1"
+    return text if coeff.denominator == 1 else f"\\frac{{{text}}}{{{coeff.denominator}}}"
+
+
+def _numeric_result(index, texts, fractions):
+    """Format a rational row's roots directly from its closed form, no sympy."""
+    disc, centre, coeff, radicand = solver.surd_roots(*fractions)
+    if radicand == 0:
+        roots, roots_latex = [str(centre)], [_frac_latex(centre)]
+    elif radicand == 1:
+        pair = (centre - coeff, centre + coeff)
+        roots, roots_latex = [str(r) for r in pair], [_frac_latex(r) for r in pair]
+    else:
+        term, term_latex = _surd_text(coeff, radicand), _surd_latex(coeff, radicand)
+        if centre == 0:
+            roots = [f"-{term}", term]
+            roots_latex = [f"- {term_latex}", term_latex]
+        else:
+            roots = [f"{centre} - {term}", f"{centre} + {term}"]
+            roots_latex = [f"{_frac_latex(centre)} - {term_latex}", f"{_frac_latex(centre)} + {term_latex}"]
+    kind = "repeated" if disc == 0 else "real" if disc > 0 else "complex"
+    return {
+        "row": index + 1, "a": texts[0], "b": texts[1], "c": texts[2],
+        "kind": kind, "discriminant": str(disc),
+        "roots": ", ".join(roots), "roots_latex": ", ".join(roots_latex), "error": "",
+    }
+
+
+def _solve_texts(index, texts):
+    """Parse and solve one row from its raw text. Runs inside budgeted children."""
+    try:
+        a, b, c = (governor.parse_coefficient(t) for t in texts)
+        # Bypass the interactive LRU so a worksheet cannot evict hot entries.
+        return _result(index, texts, solver.compute_solution(a, b, c))
+    except Exception as e:
+        return _result(index, texts, error=str(e))
+
+
+def _solve_chunk(chunk):
+    return [_solve_texts(index, texts) for index, texts in chunk]
+
+
+def _run_chunk(chunk):
+    """Solve a chunk under the governor's budget.
+
+    If the chunk as a whole runs out of time, its rows are retried one by
+    one so that only the offending rows are reported as too complex.
+    """
+    try:
+        return governor.run_with_budget(_solve_chunk, chunk, timeout=2 * governor.SOLVE_TIMEOUT)
+    except governor.TooComplexError:
+        pass
+    results = []
+    for index, texts in chunk:
+        try:
+            results.extend(governor.run_with_budget(_solve_chunk, [(index, texts)]))
+        except governor.TooComplexError as e:
+            results.append(_result(index, texts, error=str(e)))
+    return results
+
+
+def _get_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            # Threads only wait on the budgeted child processes doing the work.
+            workers = max(1, min(4, (os.cpu_count() or 2) - 1))
+            _executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="worksheet")
+        return _executor
+
+
+def solve_batch(rows, kinds=None, exact=None):
+    """Yield ``(index, result)`` pairs as soon as each row is solved.
+
+    Numeric rows are answered first, in-process; symbolic rows are solved in
+    budgeted child processes in chunks and yielded as the chunks complete.
+    """
+    if kinds is None or exact is None:
+        kinds, exact = classify(rows)
+
+    pending = []
+    for index, texts in enumerate(rows):
+        if kinds[index] == "symbolic":
+            pending.append((index, texts))
+            continue
+        if kinds[index] == "linear":
+            yield index, _result(index, texts, error="Coefficient 'a' cannot be zero for a quadratic equation!")
+            continue
+        yield index, _numeric_result(index, texts, exact[index])
+
+    if not pending:
+        return
+    executor = _get_executor()
+    chunks = [pending[i:i + CHUNK_SIZE] for i in range(0, len(pending), CHUNK_SIZE)]
+    futures = [executor.submit(_run_chunk, chunk) for chunk in chunks]
+    for future in as_completed(futures):
+        for result in future.result():
+            yield result["row"] - 1, result
+
+
+def to_csv(results):
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=FIELDS)
+    writer.writeheader()
+    writer.writerows(results)
+    return buffer.getvalue()
+
+
+def to_jsonl(results):
+    return "".join(json.dumps(r, ensure_ascii=False) + "\n" for r in results)
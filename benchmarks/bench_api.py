@@ -0,0 +1,73 @@
+"""Load generator for api.py.
+
+Start the API first, with the persistent result store disabled so that
+repeated problems are really solved (``SOLVER_STORE_PATH= python api.py
+--port 8000``), then run:
+
+    python benchmarks/bench_api.py --url http://127.0.0.1:8000 --requests 5000 --concurrency 200
+"""
+import argparse
+import asyncio
+import random
+import time
+from urllib.parse import urlsplit
+
+
+async def _worker(host, port, jobs, latencies, failures):
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        while jobs:
+            body = jobs.pop()
+            request = (
+                f"POST /solve HTTP/1.1\r\nHost: {host}\r\nContent-Type: application/json\r\n"
+                f"Content-Length: {len(body)}\r\n\r\n"
+            ).encode() + body
+            start = time.perf_counter()
+            writer.write(request)
+            await writer.drain()
+            status = int((await reader.readline()).split()[1])
+            length = 0
+            while (line := await reader.readline()) not in (b"\r\n", b""):
+                if line.lower().startswith(b"content-length:"):
+                    length = int(line.split(b":")[1])
+            await reader.readexactly(length)
+            latencies.append(time.perf_counter() - start)
+            if status != 200:
+                failures.append(status)
+    finally:
+        writer.close()
+
+
+async def run(url, total, concurrency, distinct):
+    parts = urlsplit(url)
+    rng = random.Random(0)
+    problems = [
+        (rng.randint(1, 9), rng.randint(-30, 30), rng.randint(-30, 30)) for _ in range(distinct)
+    ]
+    jobs = [
+        ('{"a": "%d", "b": "%d", "c": "%d"}' % rng.choice(problems)).encode() for _ in range(total)
+    ]
+    latencies, failures = [], []
+    start = time.perf_counter()
+    await asyncio.gather(*(
+        _worker(parts.hostname, parts.port or 80, jobs, latencies, failures) for _ in range(concurrency)
+    ))
+    wall = time.perf_counter() - start
+    latencies.sort()
+    pct = lambda q: latencies[min(len(latencies) - 1, int(len(latencies) * q))] * 1e3  # noqa: E731
+    print(f"{len(latencies)} requests in {wall:.2f}s: {len(latencies) / wall:.0f} req/s, "
+          f"p50 {pct(0.5):.1f} ms, p95 {pct(0.95):.1f} ms, p99 {pct(0.99):.1f} ms, non-200: {len(failures)}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", default="http://127.0.0.1:8000")
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=200)
+    parser.add_argument("--distinct", type=int, default=2000, help="number of distinct problems in the mix")
+    args = parser.parse_args()
+    asyncio.run(run(args.url, args.requests, args.concurrency, args.distinct))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""Compare the closed-form rational path against the generic sympy path.
+
+Run from the repository root:
+
+    python benchmarks/bench_fast_path.py
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sympy import Rational, sympify  # noqa: E402
+
+import solver  # noqa: E402
+
+PROBLEMS = [
+    (1, -5, 6),
+    (1, -6, 9),
+    (2, -7, 3),
+    (6, 5, -6),
+    (1, 0, 1),
+    (2, 3, 5),
+    (1, -2, -1),
+    (Rational(1, 2), 1, Rational(1, 8)),
+    (12, -31, 20),
+    (-4, 4, -1),
+]
+
+
+def _time(fn, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main(repeat=5):
+    print(f"{'problem':<22}{'sympy.solve':>14}{'fast path':>14}{'speed-up':>10}")
+    total_slow = total_fast = 0.0
+    for a, b, c in PROBLEMS:
+        a, b, c = sympify(a), sympify(b), sympify(c)
+        equation = a*solver.x**2 + b*solver.x + c
+        slow = _time(lambda: solver._solve_symbolic(a, b, c, equation), repeat)
+        fast = _time(lambda: solver._solve_rational(a, b, c), repeat)
+        total_slow += slow
+        total_fast += fast
+        label = f"({a}, {b}, {c})"
+        print(f"{label:<22}{slow * 1e3:>11.2f} ms{fast * 1e6:>11.1f} µs{slow / fast:>9.0f}x")
+    print(f"{'total':<22}{total_slow * 1e3:>11.2f} ms{total_fast * 1e6:>11.1f} µs{total_slow / total_fast:>9.0f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""Worst-case latency and throughput of the resource governor under hostile input.
+
+Run from the repository root:
+
+    python benchmarks/bench_governor.py
+
+Exits with status 1 if any hostile input takes longer than the solve budget
+plus a small margin, or if an input that only the time budget can stop is
+not stopped by it, so it can double as a regression check.
+"""
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# Measure real solves, not hits in (or writes to) the persistent result store.
+os.environ["SOLVER_STORE_PATH"] = ""
+
+import governor  # noqa: E402
+import solver  # noqa: E402
+
+MARGIN = 1.5
+
+HOSTILE = [
+    ("10**10**10", "1", "1"),
+    ("1", "factorial(10**6)", "1"),
+    ("1", "1", "factorial(100000)"),
+    ("1e999999999", "1", "1"),
+    ("2**3**4**5", "1", "1"),
+    ("1", "sqrt(10**10**10)", "1"),
+    ("1", "exp(10**5)", "1"),
+    ("1", "(" * 40 + "1" + ")" * 40, "1"),
+    ("1", "sqrt(" * 14 + "2" + ")" * 14, "1"),
+    ("1", "+".join(["x"] * 60), "1"),
+    ("1", "9" * 500, "1"),
+    ("__import__('os')", "1", "1"),
+    ("1", "pi.n(10**7)", "1"),
+    ("9**999", "7**999*7**999", "3**999*3**999"),
+    ("1", "sqrt(2)+sqrt(3)+sqrt(5)+sqrt(7)+sqrt(11)", "pi**7+E**5+sqrt(13)"),
+]
+
+# Pass every parse limit but cannot be solved within the budget: these must
+# be stopped by the child's time limit with TooComplexError.
+TIMEOUT = [
+    ("sqrt(2)+sqrt(3)+sqrt(5)", "pi**7+E**5+sqrt(13)+sqrt(17)", "exp(3)+log(7)+sin(5)+cos(3)"),
+]
+
+BENIGN = [
+    ("1", "-5", "6"),
+    ("2", "-7", "3"),
+    ("1", "0", "1"),
+    ("3", "-2*sqrt(6)", "2"),
+    ("1/2", "1", "1/8"),
+    ("1", "k", "1"),
+]
+
+
+def attempt(texts, timeout):
+    start = time.perf_counter()
+    try:
+        a, b, c = (governor.parse_coefficient(t) for t in texts)
+        governor.solve(a, b, c, timeout=timeout)
+        outcome = "solved"
+    except governor.TooComplexError as e:
+        outcome = f"too complex: {e}"
+    except Exception as e:
+        outcome = f"rejected: {e}"
+    return time.perf_counter() - start, outcome
+
+
+def main(timeout=2.0):
+    budget = timeout + MARGIN
+    worst = 0.0
+    print(f"{'hostile input':<44}{'latency':>10}  outcome")
+    for texts in HOSTILE:
+        solver.cache.clear()
+        elapsed, outcome = attempt(texts, timeout)
+        worst = max(worst, elapsed)
+        label = ", ".join(texts)
+        label = label if len(label) <= 40 else label[:37] + "..."
+        print(f"{label:<44}{elapsed * 1e3:>8.1f}ms  {outcome[:60]}")
+    print(f"worst case: {worst * 1e3:.1f} ms (budget {budget * 1e3:.0f} ms)")
+
+    failed = worst > budget
+    for texts in TIMEOUT:
+        solver.cache.clear()
+        elapsed, outcome = attempt(texts, timeout)
+        print(f"time budget: {elapsed * 1e3:.1f} ms, {outcome[:60]}")
+        if not outcome.startswith("too complex") or elapsed > budget:
+            print(f"FAIL: {', '.join(texts)} was not stopped by the time budget")
+            failed = True
+
+    # Throughput of ordinary requests while hostile ones are being served.
+    solver.cache.clear()
+    requests = (BENIGN * 20) + HOSTILE + TIMEOUT
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        latencies = list(pool.map(lambda t: attempt(t, timeout)[0], requests))
+    wall = time.perf_counter() - start
+    benign = sorted(latencies[:len(BENIGN) * 20])
+    print(
+        f"mixed load: {len(requests)} requests in {wall:.2f}s ({len(requests) / wall:.0f} req/s), "
+        f"benign p50 {benign[len(benign) // 2] * 1e3:.1f} ms, p95 {benign[int(len(benign) * 0.95)] * 1e3:.1f} ms"
+    )
+
+    if worst > budget:
+        print("FAIL: a hostile input exceeded the budget")
+    if failed:
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,269 @@
+"""End-to-end latency of one solve, broken down by pipeline stage.
+
+Run from the repository root:
+
+    python benchmarks/bench_pipeline.py                       # print a table
+    python benchmarks/bench_pipeline.py --output results.json # machine-readable report
+    python benchmarks/bench_pipeline.py --save-baseline       # store benchmarks/baseline.json
+    python benchmarks/bench_pipeline.py --baseline benchmarks/baseline.json
+
+Every problem in the corpus goes through the same stages as a request on the
+page: ``parse_expr`` (via the governor), ``solve``, the ``simplify`` calls,
+LaTeX generation, the rest of step building, and rendering into Streamlit
+elements (bare mode, so the protobuf messages are built but not sent). Time
+spent in ``simplify`` and ``latex`` is measured where they are called and
+taken out of the enclosing stage, so the stages add up to the total.
+
+The app's own caches are bypassed and sympy's cache is cleared before each
+run, so the numbers describe a problem the worker has not seen before.
+
+With ``--baseline`` the p95 of every stage is compared with the stored report,
+and the exit status is 1 if any of them regressed by more than the tolerance.
+"""
+import argparse
+import json
+import logging
+import os
+import platform
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# Measure real solves, not hits in (or writes to) the persistent result store.
+os.environ["SOLVER_STORE_PATH"] = ""
+
+from sympy.core.cache import clear_cache  # noqa: E402
+
+import governor  # noqa: E402
+import render  # noqa: E402
+import simplification  # noqa: E402
+import solver  # noqa: E402
+import steps  # noqa: E402
+
+BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+
+STAGES = ("parse_expr", "solve", "simplify", "latex", "steps", "render")
+PERCENTILES = (50, 95, 99)
+
+# Mirrors what students type: grouped so a regression in one kind of input
+# stays visible instead of being averaged away.
+CORPUS = {
+    "small_int": [
+        ("1", "-5", "6"),
+        ("2", "-7", "3"),
+        ("1", "2", "-15"),
+        ("3", "-10", "8"),
+        ("1", "0", "-9"),
+    ],
+    "large_int": [
+        ("123456789", "-987654321", "1000000007"),
+        ("99991", "-1234567", "424242"),
+        ("1000003", "2000006", "1000003"),
+        ("-314159265", "271828182", "161803398"),
+    ],
+    "fraction": [
+        ("1/2", "1", "1/8"),
+        ("3/4", "-5/6", "1/9"),
+        ("-2/3", "7/5", "1/2"),
+        ("5/7", "-1/3", "-11/13"),
+    ],
+    "surd": [
+        ("3", "-2*sqrt(6)", "2"),
+        ("1", "sqrt(2)", "-1"),
+        ("2", "-sqrt(3)", "-1"),
+        ("sqrt(2)", "3", "sqrt(2)"),
+    ],
+    "perfect_square": [
+        ("1", "-6", "9"),
+        ("4", "12", "9"),
+        ("6", "5", "-6"),
+        ("12", "-31", "20"),
+    ],
+    "negative_discriminant": [
+        ("1", "0", "1"),
+        ("2", "3", "5"),
+        ("1", "2", "5"),
+        ("5", "-2", "1"),
+    ],
+    "symbolic": [
+        ("1", "k", "1"),
+        ("1", "-2*m", "m**2"),
+        ("k", "1", "k"),
+        ("1", "p+q", "p*q"),
+    ],
+}
+
+
+class _Sink:
+    """Accumulates the time spent inside wrapped functions."""
+
+    def __init__(self):
+        self.elapsed = 0.0
+
+    def wrap(self, fn):
+        def timed(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                self.elapsed += time.perf_counter() - start
+        return timed
+
+
+def _instrument():
+    """Route the pipeline's simplification and latex() calls through timing sinks."""
+    simplify, latex = _Sink(), _Sink()
+    solver.quick_simplify = simplify.wrap(solver.quick_simplify)
+    steps.quick_simplify = simplify.wrap(steps.quick_simplify)
+    steps.latex = latex.wrap(steps.latex)
+    return simplify, latex
+
+
+def _bare_streamlit():
+    # Streamlit resets its loggers' levels when its config loads, so silence
+    # the per-element "missing ScriptRunContext" warning with a filter.
+    logging.getLogger("streamlit.runtime.scriptrunner_utils.script_run_context").addFilter(lambda record: False)
+    return render.st
+
+
+def _render_all(solution_steps, out):
+    """Render every method the way the method view shows the selected one."""
+    for label, name in render.METHODS.items():
+        out.markdown(f"## {label}")
+        render.render_section(getattr(solution_steps, name), out)
+
+
+def run_once(texts, simplify, latex, out):
+    """Time one problem through every stage; returns seconds per stage."""
+    clear_cache()
+    simplification.quick_simplify.cache_clear()
+    simplify.elapsed = latex.elapsed = 0.0
+    timings = {}
+
+    start = time.perf_counter()
+    a, b, c = (governor.parse_coefficient(t) for t in texts)
+    timings["parse_expr"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    solution = solver.compute_solution(a, b, c)
+    solve_s = time.perf_counter() - start
+    solve_simplify = simplify.elapsed
+    timings["solve"] = solve_s - solve_simplify
+
+    start = time.perf_counter()
+    solution_steps = steps.build_steps(solution)
+    steps.answer_latex(solution)
+    build_s = time.perf_counter() - start
+    timings["simplify"] = simplify.elapsed
+    timings["latex"] = latex.elapsed
+    timings["steps"] = build_s - (simplify.elapsed - solve_simplify) - latex.elapsed
+
+    start = time.perf_counter()
+    _render_all(solution_steps, out)
+    timings["render"] = time.perf_counter() - start
+
+    timings["total"] = sum(timings.values())
+    return timings
+
+
+def _percentiles(samples):
+    if len(samples) == 1:
+        return {f"p{p}": round(samples[0] * 1e3, 4) for p in PERCENTILES}
+    cuts = statistics.quantiles(samples, n=100, method="inclusive")
+    return {f"p{p}": round(cuts[p - 1] * 1e3, 4) for p in PERCENTILES}
+
+
+def run(repeat=5):
+    """Run the whole corpus ``repeat`` times and summarise it as a JSON-ready report."""
+    simplify, latex = _instrument()
+    out = _bare_streamlit()
+    by_stage = {stage: [] for stage in STAGES + ("total",)}
+    by_category = {}
+    for category, problems in CORPUS.items():
+        totals = by_category.setdefault(category, [])
+        for texts in problems:
+            # One untimed pass pays for imports and first-call setup.
+            run_once(texts, simplify, latex, out)
+            for _ in range(repeat):
+                timings = run_once(texts, simplify, latex, out)
+                for stage, seconds in timings.items():
+                    by_stage[stage].append(seconds)
+                totals.append(timings["total"])
+
+    return {
+        "unit": "ms",
+        "repeat": repeat,
+        "problems": sum(len(p) for p in CORPUS.values()),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "stages": {stage: _percentiles(samples) for stage, samples in by_stage.items()},
+        "categories": {category: _percentiles(samples) for category, samples in by_category.items()},
+    }
+
+
+def compare(report, baseline, tolerance, floor_ms):
+    """Return the stages and categories whose p95 regressed against ``baseline``.
+
+    A slowdown counts only if it exceeds both the relative ``tolerance`` and
+    ``floor_ms``, so sub-millisecond stages do not fail on timer noise.
+    """
+    regressions = []
+    for section, label in (("stages", "stage"), ("categories", "category")):
+        for name, current in report[section].items():
+            before = baseline.get(section, {}).get(name)
+            if before is None:
+                continue
+            now, then = current["p95"], before["p95"]
+            if now > then * (1 + tolerance) and now - then > floor_ms:
+                regressions.append((f"{label} {name}", then, now))
+    return regressions
+
+
+def _print_table(report):
+    print(f"{'':<24}{'p50':>10}{'p95':>10}{'p99':>10}   (ms)")
+    for section in ("stages", "categories"):
+        for name, p in report[section].items():
+            print(f"{name:<24}{p['p50']:>10.2f}{p['p95']:>10.2f}{p['p99']:>10.2f}")
+        print()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Per-stage latency benchmark for the quadratic solver.")
+    parser.add_argument("--repeat", type=int, default=5, help="timed runs per problem")
+    parser.add_argument("--output", help="write the JSON report to this file ('-' for stdout)")
+    parser.add_argument("--baseline", help="compare against this stored report and fail on regression")
+    parser.add_argument("--save-baseline", nargs="?", const=BASELINE, metavar="PATH",
+                        help=f"store this run as the baseline (default {os.path.relpath(BASELINE)})")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed relative p95 slowdown")
+    parser.add_argument("--floor-ms", type=float, default=1.0, help="ignore p95 slowdowns smaller than this")
+    args = parser.parse_args(argv)
+
+    report = run(args.repeat)
+    if args.output == "-":
+        print(json.dumps(report, indent=2))
+    else:
+        _print_table(report)
+        if args.output:
+            with open(args.output, "w") as f:
+                json.dump(report, f, indent=2)
+    if args.save_baseline:
+        with open(args.save_baseline, "w") as f:
+            json.dump(report, f, indent=2)
+            f.write("\n")
+        print(f"baseline saved to {args.save_baseline}", file=sys.stderr)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare(report, baseline, args.tolerance, args.floor_ms)
+        for name, then, now in regressions:
+            print(f"REGRESSION {name}: p95 {then:.2f} ms -> {now:.2f} ms", file=sys.stderr)
+        if regressions:
+            return 1
+        print(f"no p95 regressions beyond {args.tolerance:.0%} against {args.baseline}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
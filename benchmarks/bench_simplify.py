@@ -0,0 +1,90 @@
+"""Compare ``quick_simplify`` with ``sympy.simplify`` on the pipeline corpus.
+
+Run from the repository root:
+
+    python benchmarks/bench_simplify.py
+    python benchmarks/bench_simplify.py --verbose   # list every expression
+
+Every expression the solver and the step builder simplify while working
+through ``bench_pipeline.CORPUS`` is simplified both ways, with sympy's cache
+(and the memo in ``simplification``) cleared before each call. The exit
+status is 1 if any result differs in value from ``simplify`` or if the total
+speedup is below ``--min-speedup``.
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# Measure real solves, not hits in (or writes to) the persistent result store.
+os.environ["SOLVER_STORE_PATH"] = ""
+
+from sympy import simplify  # noqa: E402
+from sympy.core.cache import clear_cache  # noqa: E402
+
+import governor  # noqa: E402
+import simplification  # noqa: E402
+import solver  # noqa: E402
+import steps  # noqa: E402
+from bench_pipeline import CORPUS  # noqa: E402
+
+
+def collect():
+    """Return the arguments of every simplification made while solving the corpus."""
+    seen = []
+
+    def record(expr):
+        seen.append(expr)
+        return simplification.quick_simplify(expr)
+
+    solver.quick_simplify = steps.quick_simplify = record
+    try:
+        for problems in CORPUS.values():
+            for texts in problems:
+                a, b, c = (governor.parse_coefficient(t) for t in texts)
+                steps.build_steps(solver.compute_solution(a, b, c))
+    finally:
+        solver.quick_simplify = steps.quick_simplify = simplification.quick_simplify
+    return seen
+
+
+def _timed(fn, expr):
+    clear_cache()
+    simplification.quick_simplify.cache_clear()
+    start = time.perf_counter()
+    result = fn(expr)
+    return result, time.perf_counter() - start
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Targeted simplification against sympy.simplify.")
+    parser.add_argument("--min-speedup", type=float, default=10.0)
+    parser.add_argument("--verbose", action="store_true")
+    args = parser.parse_args(argv)
+
+    exprs = collect()
+    slow = fast = 0.0
+    mismatches = 0
+    for expr in exprs:
+        expected, slow_s = _timed(simplify, expr)
+        got, fast_s = _timed(simplification.quick_simplify, expr)
+        slow += slow_s
+        fast += fast_s
+        equal = got == expected or simplify(got - expected) == 0
+        if not equal:
+            mismatches += 1
+            print(f"MISMATCH {expr}: simplify gives {expected}, quick_simplify gives {got}", file=sys.stderr)
+        elif args.verbose:
+            print(f"{slow_s * 1e3:8.2f} {fast_s * 1e3:8.2f} ms  {expr}  ->  {got}")
+
+    speedup = slow / fast if fast else float("inf")
+    print(f"{len(exprs)} expressions: simplify {slow * 1e3:.1f} ms, quick_simplify {fast * 1e3:.1f} ms "
+          f"({speedup:.1f}x), {mismatches} mismatches")
+    if mismatches or speedup < args.min_speedup:
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
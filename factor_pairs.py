@@ -0,0 +1,180 @@
+"""Factor-pair search for splitting the middle term of ax² + bx + c.
+
+Splitting the middle term means finding two integers ``p`` and ``q`` with
+``p * q == a * c`` and ``p + q == b``. Such a pair exists exactly when the
+discriminant ``b² - 4ac`` is a perfect square, so that check rejects
+unfactorable equations in O(1). Otherwise the divisors of ``a * c`` are
+enumerated to find the pair and to list the candidates a student would try.
+
+Divisors of products up to ``INDEX_LIMIT`` (coefficients up to ±100, the
+range the syllabus uses) come from a precomputed index. Larger products
+are factored by trial division over a small-prime sieve. When that cannot
+finish, the pair is read off the closed form ``(b ∓ √Δ) / 2`` instead.
+
+Rational coefficients are first scaled to integers by the least common
+multiple of their denominators.
+"""
+import threading
+from dataclasses import dataclass
+from fractions import Fraction
+from math import gcd, isqrt, lcm
+
+INDEX_LIMIT = 10_000
+SIEVE_LIMIT = 1 << 12
+MAX_CANDIDATES = 12
+
+_lock = threading.Lock()
+_index = None
+_primes = None
+
+
+@dataclass(frozen=True, slots=True)
+class Split:
+    # Integer coefficients after multiplying the equation by ``scale``.
+    scale: int
+    a: int
+    b: int
+    c: int
+    product: int
+    # Factor pairs (p, q) of ``product`` in the order a student would try them,
+    # up to and including the one that works; empty if the list would be too long.
+    candidates: tuple
+    # (p, q) with p * q == product and p + q == b, or None if not factorable.
+    pair: tuple = None
+    # ((g1, g2), (a1, p1)) such that ax² + bx + c == (g1·x + g2)(a1·x + p1).
+    factors: tuple = None
+
+    @property
+    def factorable(self):
+        return self.pair is not None
+
+    @property
+    def discriminant(self):
+        return self.b * self.b - 4 * self.a * self.c
+
+    @property
+    def roots(self):
+        """Roots read off the two factors, as ``Fraction`` values."""
+        (g1, g2), (a1, p1) = self.factors
+        return Fraction(-g2, g1), Fraction(-p1, a1)
+
+
+def _sieve(limit):
+    flags = bytearray([1]) * (limit + 1)
+    flags[0:2] = b"\x00\x00"
+    for p in range(2, isqrt(limit) + 1):
+        if flags[p]:
+            flags[p * p::p] = bytes(len(range(p * p, limit + 1, p)))
+    return [p for p, is_prime in enumerate(flags) if is_prime]
+
+
+def _build_index(limit):
+    index = [[] for _ in range(limit + 1)]
+    for d in range(1, limit + 1):
+        for multiple in range(d, limit + 1, d):
+            index[multiple].append(d)
+    return [tuple(ds) for ds in index]
+
+
+def _tables():
+    global _index, _primes
+    if _index is None:
+        with _lock:
+            if _index is None:
+                _primes = _sieve(SIEVE_LIMIT)
+                _index = _build_index(INDEX_LIMIT)
+    return _index, _primes
+
+
+def _factorize(n):
+    """Prime factorization of ``n > 0`` as ``{prime: exponent}``, or None if the sieve is too small."""
+    _, primes = _tables()
+    factors = {}
+    for p in primes:
+        if p * p > n:
+            break
+        if n % p == 0:
+            count = 0
+            while n % p == 0:
+                n //= p
+                count += 1
+            factors[p] = count
+    if n > 1:
+        if n > SIEVE_LIMIT * SIEVE_LIMIT:
+            return None
+        factors[n] = factors.get(n, 0) + 1
+    return factors
+
+
+def divisors(n):
+    """Positive divisors of ``|n|`` in ascending order, or None if ``n`` is too large to factor."""
+    n = abs(n)
+    index, _ = _tables()
+    if n <= INDEX_LIMIT:
+        return index[n]
+    factors = _factorize(n)
+    if factors is None:
+        return None
+    result = [1]
+    for p, count in factors.items():
+        result = [d * p ** k for d in result for k in range(count + 1)]
+    return tuple(sorted(result))
+
+
+def factor_pairs(n):
+    """Yield the integer pairs (p, q) with p * q == n, smallest |p| first, positive before negative."""
+    ds = divisors(n)
+    if ds is None:
+        return
+    for d in ds:
+        if d * d > abs(n):
+            break
+        yield d, n // d
+        yield -d, -(n // d)
+
+
+def integer_coefficients(a, b, c):
+    """Scale rational coefficients to integers; returns ``(scale, a, b, c)``."""
+    a, b, c = Fraction(a), Fraction(b), Fraction(c)
+    scale = lcm(a.denominator, b.denominator, c.denominator)
+    return scale, int(a * scale), int(b * scale), int(c * scale)
+
+
+def _group(a, p, q):
+    g1 = gcd(a, p) * (1 if a > 0 else -1)
+    a1, p1 = a // g1, p // g1
+    return (g1, q // a1), (a1, p1)
+
+
+def find_split(a, b, c):
+    """Find the middle-term split of ax² + bx + c for rational ``a != 0``, ``b`` and ``c``."""
+    scale, a, b, c = integer_coefficients(a, b, c)
+    if a == 0:
+        raise ValueError("Coefficient 'a' cannot be zero for a quadratic equation!")
+    product = a * c
+    disc = b * b - 4 * product
+    root = isqrt(disc) if disc >= 0 else -1
+    factorable = root >= 0 and root * root == disc
+
+    if product == 0:
+        # ax² + bx = x(ax + b): the only split is b and 0.
+        pair = (b, 0)
+        return Split(scale, a, b, c, product, (pair,), pair, _group(a, *pair))
+
+    candidates = []
+    pair = None
+    for p, q in factor_pairs(product):
+        candidates.append((p, q))
+        if not factorable and len(candidates) > MAX_CANDIDATES:
+            break
+        if factorable and p + q == b:
+            pair = (p, q)
+            break
+    if factorable and pair is None:
+        # Too large to enumerate: the pair is the root pair of t² - bt + ac.
+        pair = ((b - root) // 2, (b + root) // 2)
+        candidates = []
+    if len(candidates) > MAX_CANDIDATES:
+        candidates = []
+    factors = _group(a, *pair) if pair is not None else None
+    return Split(scale, a, b, c, product, tuple(candidates), pair, factors)
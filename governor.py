@@ -0,0 +1,285 @@
+"""Resource governor for untrusted coefficient text and symbolic solves.
+
+Raw input from the text boxes is checked in three layers before any real
+work is done on a shared Streamlit worker:
+
+1. lexical limits on the text itself (length, names, literal sizes), so
+   ``parse_expr`` never sees something like ``1e999999999``;
+2. a structural check of the *unevaluated* expression tree (node count,
+   depth and an estimate of how many digits evaluating it would produce),
+   which rejects ``10**10**10`` or ``factorial(10**6)`` without computing them;
+3. a CPU/time budget for the symbolic solve and step building, which run in
+   a separate process that is killed when the budget runs out.
+
+Rational coefficients skip layer 3: the closed-form fast path is bounded by
+the digit limit of layer 2 and by the solver's cap on the size of the
+radicand, whose square root sympy would otherwise try to factor.
+"""
+import functools
+import io
+import math
+import multiprocessing
+import os
+import threading
+import tokenize
+from concurrent.futures import Future
+
+import sympy
+from sympy.parsing.sympy_parser import parse_expr
+
+import solver
+import steps
+from store import results
+
+MAX_INPUT_LENGTH = 100
+MAX_LITERAL_DIGITS = 40
+MAX_NODES = 80
+MAX_DEPTH = 12
+MAX_DIGITS = 2000
+MAX_EXPONENT = 1000
+MAX_FACTORIAL = 500
+SOLVE_TIMEOUT = 5.0
+MEMORY_LIMIT = 1024 * 1024 * 1024
+
+FUNCTIONS = ("sqrt", "cbrt", "root", "factorial", "exp", "log", "sin", "cos", "tan", "Abs")
+CONSTANTS = ("pi", "E", "I")
+# Needed by parse_expr's own transformations.
+_PARSER_NAMES = ("Integer", "Float", "Rational", "Symbol", "Function", "Add", "Mul", "Pow", "Not")
+
+
+class TooComplexError(ValueError):
+    """The input or its solve exceeded the governor's limits."""
+
+
+def _namespace(evaluate):
+    names = {name: getattr(sympy, name) for name in _PARSER_NAMES + CONSTANTS}
+    for name in FUNCTIONS:
+        fn = getattr(sympy, name)
+        # Function calls evaluate their literal arguments even under
+        # evaluate=False, so wrap them to keep the first parse inert.
+        names[name] = fn if evaluate else functools.partial(fn, evaluate=False)
+    names["__builtins__"] = {}
+    return names
+
+
+_LAZY_NAMESPACE = _namespace(evaluate=False)
+_NAMESPACE = _namespace(evaluate=True)
+
+
+def _check_text(text):
+    if len(text) > MAX_INPUT_LENGTH:
+        raise TooComplexError(f"Input is too long (limit {MAX_INPUT_LENGTH} characters).")
+    if "__" in text:
+        raise ValueError("Invalid input.")
+    try:
+        tokens = list(tokenize.generate_tokens(io.StringIO(text).readline))
+    except (tokenize.TokenError, SyntaxError) as e:
+        raise ValueError(f"invalid syntax: {e}") from None
+    previous = None
+    for tok in tokens:
+        if tok.type == tokenize.NUMBER:
+            mantissa, _, exponent = tok.string.lower().replace("_", "").partition("e")
+            if len(mantissa) > MAX_LITERAL_DIGITS or len(exponent.lstrip("+-")) > 3:
+                raise TooComplexError("Number literal is too large.")
+        elif tok.type == tokenize.NAME:
+            name = tok.string
+            # Attribute access such as pi.n(10**5) would run in-process
+            # during parsing, before any of the limits below apply.
+            if previous is not None and previous.type == tokenize.OP and previous.string == ".":
+                raise ValueError("Invalid input.")
+            if name not in FUNCTIONS and name not in CONSTANTS and not (name.isalnum() and len(name) <= 3):
+                raise ValueError(f"Unknown name '{name}'.")
+        previous = tok
+
+
+def _magnitude(expr, depth=0):
+    """Estimate log10 of the size of ``expr`` once evaluated, checking limits as it goes."""
+    if depth > MAX_DEPTH:
+        raise TooComplexError("Expression is nested too deeply.")
+    if expr.is_Integer:
+        return len(str(abs(int(expr))))
+    if expr.is_Rational:
+        return max(len(str(abs(expr.p))), len(str(expr.q)))
+    if expr.is_Float:
+        # Read the binary exponent off the mpf: float() would turn 1e-400
+        # into 0.0 and 1e400 into inf.
+        _, mantissa, exponent, bits = expr._mpf_
+        return abs(exponent + bits) * math.log10(2) + 1 if mantissa else 1
+    if expr.is_Atom:
+        return 1
+
+    args = [_magnitude(arg, depth + 1) for arg in expr.args]
+    if expr.is_Add:
+        size = max(args) + 1
+    elif expr.is_Mul:
+        size = sum(args)
+    elif expr.is_Pow:
+        base, exponent = expr.args
+        if not exponent.is_number:
+            raise TooComplexError("Only numeric exponents are supported.")
+        if args[1] > math.log10(MAX_EXPONENT) + 1:
+            raise TooComplexError("Exponent is too large.")
+        size = args[0] * max(1.0, abs(float(exponent)))
+    elif isinstance(expr, sympy.factorial):
+        if args[0] > 3 or abs(float(expr.args[0])) > MAX_FACTORIAL:
+            raise TooComplexError(f"Factorials are limited to n <= {MAX_FACTORIAL}.")
+        n = max(2.0, abs(float(expr.args[0])))
+        size = n * math.log10(n)
+    elif isinstance(expr, sympy.exp):
+        if args[0] > 3:
+            raise TooComplexError("Exponent is too large.")
+        size = abs(float(expr.args[0])) / math.log(10) + 1 if expr.args[0].is_number else args[0]
+    elif isinstance(expr, sympy.core.function.AppliedUndef):
+        raise ValueError(f"Unknown function '{expr.func}'.")
+    else:
+        size = max(args) + 1
+
+    if size > MAX_DIGITS:
+        raise TooComplexError(f"Expression would have more than {MAX_DIGITS} digits.")
+    return size
+
+
+def parse_coefficient(text):
+    """Parse one coefficient from user text, enforcing the complexity limits."""
+    text = text.strip()
+    _check_text(text)
+    lazy = parse_expr(text, global_dict=_LAZY_NAMESPACE, evaluate=False)
+    if sum(1 for _ in sympy.preorder_traversal(lazy)) > MAX_NODES:
+        raise TooComplexError("Expression is too long.")
+    _magnitude(lazy)
+    value = parse_expr(text, global_dict=_NAMESPACE)
+    # A coefficient in x would change the degree of the equation.
+    if value.has(solver.x):
+        raise ValueError("Coefficients cannot contain x, the variable being solved for.")
+    if value.has(sympy.zoo, sympy.oo, -sympy.oo, sympy.nan):
+        raise ValueError("Coefficients must be finite.")
+    return value
+
+
+# ---------- budgeted solving ----------
+
+if "fork" in multiprocessing.get_all_start_methods():
+    # Streamlit runs the app as ``__main__``, so "spawn" and "forkserver"
+    # children would re-execute the whole page while importing it. A forked
+    # child inherits the warm interpreter instead; should it ever deadlock on
+    # a lock held by another server thread, the budget below kills it.
+    _context = multiprocessing.get_context("fork")
+else:
+    _context = multiprocessing.get_context("spawn")
+
+
+def _address_space():
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[0]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError, AttributeError):
+        return 0
+
+
+def _limit_resources(seconds):
+    try:
+        import resource
+    except ImportError:
+        return
+    cpu = math.ceil(seconds) + 1
+    resource.setrlimit(resource.RLIMIT_CPU, (cpu, cpu + 1))
+    # The forked child inherits the worker's whole address space, which grows
+    # past a gigabyte once pandas/pyarrow are loaded for st.dataframe, so the
+    # limit is headroom on top of what is already mapped.
+    limit = _address_space() + MEMORY_LIMIT
+    try:
+        resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+    except (ValueError, OSError):
+        pass
+
+
+def _child(conn, fn, args, seconds):
+    _limit_resources(seconds)
+    try:
+        conn.send(("ok", fn(*args)))
+    except Exception as e:
+        conn.send(("error", str(e)))
+    finally:
+        conn.close()
+
+
+def run_with_budget(fn, *args, timeout=SOLVE_TIMEOUT):
+    """Run ``fn(*args)`` in a killable child process with a CPU/time budget.
+
+    Raises ``TooComplexError`` when the budget runs out or the child dies.
+    """
+    receiver, sender = _context.Pipe(duplex=False)
+    process = _context.Process(target=_child, args=(sender, fn, args, timeout), daemon=True)
+    process.start()
+    sender.close()
+    try:
+        if not receiver.poll(timeout):
+            raise TooComplexError("This problem is too complex to solve within the time limit.")
+        status, value = receiver.recv()
+    except EOFError:
+        raise TooComplexError("This problem is too complex to solve within the resource limits.") from None
+    finally:
+        receiver.close()
+        if process.is_alive():
+            process.kill()
+        process.join()
+    if status == "error":
+        raise ValueError(value)
+    return value
+
+
+def _solve_and_build(a, b, c):
+    solution = solver.compute_solution(a, b, c)
+    return solution, steps.build_steps(solution)
+
+
+_inflight = {}
+_inflight_lock = threading.Lock()
+
+
+def solve(a, b, c, timeout=SOLVE_TIMEOUT):
+    """Solve under the governor and fill the solution and step caches.
+
+    Rational problems use the in-process fast path. Everything else is
+    looked up in the persistent store, or else solved, and its steps built,
+    in a budgeted child process; concurrent requests for the same problem
+    share one child instead of each forking.
+    """
+    a, b, c = sympy.sympify(a), sympy.sympify(b), sympy.sympify(c)
+    if a.is_Rational and b.is_Rational and c.is_Rational:
+        try:
+            return solver.solve_quadratic(a, b, c)
+        except solver.RadicandTooLargeError as e:
+            raise TooComplexError(str(e)) from None
+
+    key = solver.canonical_key(a, b, c)
+    solution = solver.cache.get(key)
+    if solution is not None:
+        return solution
+
+    with _inflight_lock:
+        future = _inflight.get(key)
+        owner = future is None
+        if owner:
+            future = _inflight[key] = Future()
+    if not owner:
+        return future.result()
+
+    try:
+        solution = results.get(key + ("solution",))
+        if solution is None:
+            solution, solution_steps = run_with_budget(_solve_and_build, a, b, c, timeout=timeout)
+            results.put(key + ("solution",), solution)
+            for name in steps.SECTIONS:
+                section = getattr(solution_steps, name)
+                steps.cache.put(key + (name,), section)
+                results.put(key + (name,), section)
+        solver.cache.put(key, solution)
+        future.set_result(solution)
+        return solution
+    except BaseException as e:
+        future.set_exception(e)
+        raise
+    finally:
+        with _inflight_lock:
+            del _inflight[key]
@@ -0,0 +1,300 @@
+"""Low-overhead per-request timing, cache and memory metrics.
+
+Every script run (and every rerun of the method fragment) is one request.
+Code marks its stages with ``with metrics.stage("solve"):``. Stages nest,
+and time is charged to the innermost one only, so the ``simplify`` and
+``latex`` calls made while building steps do not also count as ``steps``.
+Outside a request ``stage`` does nothing, which keeps the solver modules
+usable from the API, the batch mode and the benchmarks.
+
+Finished requests feed Prometheus-style histograms and a short ring buffer
+for the debug panel. If ``SOLVER_METRICS_FILE`` is set they are also
+exported: a ``.prom`` file is rewritten in the Prometheus text format at
+most every ``SOLVER_METRICS_INTERVAL`` seconds, and any other file gets one
+JSON line per request.
+"""
+import json
+import logging
+import os
+import statistics
+import threading
+import time
+from collections import deque
+from time import perf_counter
+
+logger = logging.getLogger(__name__)
+
+EXPORT_PATH = os.environ.get("SOLVER_METRICS_FILE")
+EXPORT_INTERVAL = float(os.environ.get("SOLVER_METRICS_INTERVAL", 10))
+
+STAGE_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+SIZE_BUCKETS = (5, 10, 20, 40, 80, 160)
+RECENT = 500
+
+_local = threading.local()
+_lock = threading.Lock()
+
+
+class Request:
+    """Stage durations and annotations of one script run."""
+
+    __slots__ = ("kind", "started", "stages", "fields", "_stack")
+
+    def __init__(self, kind):
+        self.kind = kind
+        self.started = perf_counter()
+        self.stages = {}
+        self.fields = {}
+        self._stack = []
+
+    def _charge(self, now):
+        if self._stack:
+            name, since = self._stack[-1]
+            self.stages[name] = self.stages.get(name, 0.0) + now - since
+
+
+class _Stage:
+    __slots__ = ("name", "request")
+
+    def __init__(self, name):
+        self.name = name
+        self.request = None
+
+    def __enter__(self):
+        request = getattr(_local, "request", None)
+        if request is not None:
+            now = perf_counter()
+            request._charge(now)
+            request._stack.append((self.name, now))
+            self.request = request
+        return self
+
+    def __exit__(self, *exc):
+        request = self.request
+        if request is not None:
+            now = perf_counter()
+            request._charge(now)
+            request._stack.pop()
+            if request._stack:
+                request._stack[-1] = (request._stack[-1][0], now)
+        return False
+
+
+def stage(name):
+    """Context manager charging the enclosed time to stage ``name`` of the current request."""
+    return _Stage(name)
+
+
+def current():
+    """The request being measured on this thread, or ``None``."""
+    return getattr(_local, "request", None)
+
+
+def begin(kind):
+    """Start measuring a request on this thread, replacing any unfinished one."""
+    request = _local.request = Request(kind)
+    return request
+
+
+def finish(request):
+    """Stop measuring ``request`` and record it."""
+    if getattr(_local, "request", None) is request:
+        _local.request = None
+    registry.record(request, perf_counter() - request.started)
+
+
+class _Scope:
+    __slots__ = ("kind", "owned")
+
+    def __init__(self, kind):
+        self.kind = kind
+        self.owned = None
+
+    def __enter__(self):
+        active = current()
+        if active is not None:
+            return active
+        self.owned = begin(self.kind)
+        return self.owned
+
+    def __exit__(self, *exc):
+        if self.owned is not None:
+            finish(self.owned)
+        return False
+
+
+def request(kind):
+    """Measure the enclosed block as a request, or join the one already running."""
+    return _Scope(kind)
+
+
+def rss_bytes():
+    """Resident memory of this worker process (peak RSS where /proc is unavailable)."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError, AttributeError):
+        pass
+    try:
+        import resource
+    except ImportError:
+        return 0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if os.uname().sysname == "Darwin" else peak * 1024
+
+
+class _Histogram:
+    __slots__ = ("buckets", "counts", "sum", "count")
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+                break
+        self.sum += value
+        self.count += 1
+
+    def lines(self, name, label=""):
+        prefix = f"{label}," if label else ""
+        suffix = f"{{{label}}}" if label else ""
+        cumulative = 0
+        for bound, n in zip(self.buckets, self.counts):
+            cumulative += n
+            yield f'{name}_bucket{{{prefix}le="{bound}"}} {cumulative}'
+        yield f'{name}_bucket{{{prefix}le="+Inf"}} {self.count}'
+        yield f"{name}_sum{suffix} {self.sum:.6f}"
+        yield f"{name}_count{suffix} {self.count}"
+
+
+class Registry:
+    """Aggregates finished requests and exports them."""
+
+    def __init__(self, path=EXPORT_PATH, interval=EXPORT_INTERVAL):
+        self.path = path
+        self.interval = interval
+        self.caches = {}
+        self.requests = {}
+        self.stages = {}
+        self.durations = {}
+        self.sizes = _Histogram(SIZE_BUCKETS)
+        self.recent = deque(maxlen=RECENT)
+        self.rss = 0
+        self._last_export = 0.0
+
+    def register_cache(self, name, cache):
+        """Report ``cache.stats()`` under ``name``."""
+        self.caches[name] = cache
+
+    def record(self, request, duration):
+        rss = rss_bytes()
+        entry = {
+            "ts": round(time.time(), 3),
+            "pid": os.getpid(),
+            "kind": request.kind,
+            "duration_s": round(duration, 6),
+            "stages": {name: round(s, 6) for name, s in request.stages.items()},
+            "rss_bytes": rss,
+            **request.fields,
+        }
+        with _lock:
+            self.rss = rss
+            self.requests[request.kind] = self.requests.get(request.kind, 0) + 1
+            hist = self.durations.get(request.kind)
+            if hist is None:
+                hist = self.durations[request.kind] = _Histogram(STAGE_BUCKETS)
+            hist.observe(duration)
+            for name, seconds in request.stages.items():
+                hist = self.stages.get(name)
+                if hist is None:
+                    hist = self.stages[name] = _Histogram(STAGE_BUCKETS)
+                hist.observe(seconds)
+            if "expr_nodes" in request.fields:
+                self.sizes.observe(request.fields["expr_nodes"])
+            self.recent.append(entry)
+        if self.path:
+            self._export(entry)
+
+    def _export(self, entry):
+        try:
+            if not self.path.endswith(".prom"):
+                line = json.dumps(entry, separators=(",", ":")) + "\n"
+                with _lock, open(self.path, "a") as f:
+                    f.write(line)
+                return
+            now = perf_counter()
+            if now - self._last_export < self.interval:
+                return
+            self._last_export = now
+            text = self.to_prometheus()
+            tmp = f"{self.path}.{os.getpid()}.tmp"
+            with open(tmp, "w") as f:
+                f.write(text)
+            os.replace(tmp, self.path)
+        except OSError:
+            logger.exception("Could not write metrics to %s", self.path)
+
+    def cache_stats(self):
+        return {name: cache.stats() for name, cache in self.caches.items()}
+
+    def summary(self):
+        """Per-stage p50/p95 (ms) over the recent requests, for the debug panel."""
+        with _lock:
+            recent = list(self.recent)
+        samples = {}
+        for entry in recent:
+            samples.setdefault("total", []).append(entry["duration_s"])
+            for name, seconds in entry["stages"].items():
+                samples.setdefault(name, []).append(seconds)
+        summary = {}
+        for name, values in samples.items():
+            values.sort()
+            summary[name] = {
+                "count": len(values),
+                "p50_ms": round(statistics.median(values) * 1e3, 3),
+                "p95_ms": round(values[min(len(values) - 1, int(len(values) * 0.95))] * 1e3, 3),
+            }
+        return summary
+
+    def to_prometheus(self):
+        lines = [
+            "# HELP solver_requests_total Script runs measured, by kind.",
+            "# TYPE solver_requests_total counter",
+        ]
+        with _lock:
+            lines += [f'solver_requests_total{{kind="{k}"}} {n}' for k, n in self.requests.items()]
+            lines += [
+                "# HELP solver_request_seconds Wall time of one script run.",
+                "# TYPE solver_request_seconds histogram",
+            ]
+            for kind, hist in self.durations.items():
+                lines += hist.lines("solver_request_seconds", f'kind="{kind}"')
+            lines += [
+                "# HELP solver_stage_seconds Time spent in each stage of a script run.",
+                "# TYPE solver_stage_seconds histogram",
+            ]
+            for name, hist in self.stages.items():
+                lines += hist.lines("solver_stage_seconds", f'stage="{name}"')
+            lines += [
+                "# HELP solver_expression_nodes Size of the solved equation's expression tree.",
+                "# TYPE solver_expression_nodes histogram",
+                *self.sizes.lines("solver_expression_nodes"),
+                "# HELP solver_worker_rss_bytes Resident memory of the worker process.",
+                "# TYPE solver_worker_rss_bytes gauge",
+                f"solver_worker_rss_bytes {self.rss}",
+            ]
+        stats = self.cache_stats()
+        for metric, key, kind in (("hits_total", "hits", "counter"), ("misses_total", "misses", "counter"),
+                                  ("entries", "size", "gauge")):
+            lines.append(f"# TYPE solver_cache_{metric} {kind}")
+            lines += [f'solver_cache_{metric}{{cache="{name}"}} {s[key]}' for name, s in stats.items()]
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+register_cache = registry.register_cache
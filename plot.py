@@ -0,0 +1,164 @@
+"""Graph of y = ax² + bx + c for the plot panel.
+
+The curve is sampled with NumPy through a lambdified expression. Instead of
+a dense uniform grid, a coarse grid spans a window sized to the roots (or,
+when they are complex, to their imaginary part) and short clusters of points
+are added around the vertex and each root, where the eye looks. That keeps
+the chart payload around a hundred points at any scale.
+
+The result is a Vega-Lite spec, so the browser draws it and handles zooming
+and panning itself.
+"""
+from dataclasses import dataclass
+
+import numpy as np
+from sympy import lambdify
+
+from solver import x
+
+GRID_POINTS = 64
+CLUSTER_POINTS = 9
+# Clusters cover this fraction of the window on either side of their point.
+CLUSTER_WIDTH = 0.06
+# The window reaches this far past the roots, as a multiple of their spread.
+MARGIN = 2.0
+
+VERTEX_COLOUR = "#ffd700"
+ROOT_COLOUR = "#e74c3c"
+CURVE_COLOUR = "#27ae60"
+
+
+@dataclass(frozen=True, slots=True)
+class Parabola:
+    vertex: tuple
+    # Real roots in ascending order; empty when they are complex.
+    roots: tuple
+    # (real, imaginary) parts of the root with positive imaginary part, or None.
+    complex_root: tuple
+    xs: np.ndarray
+    ys: np.ndarray
+
+
+def _real(v):
+    return v.is_number and v.is_real is True
+
+
+def sample(a, b, c):
+    """Sample the parabola for sympy coefficients, or return None if it cannot be drawn.
+
+    Only real numeric coefficients give a curve in the real plane, and only
+    while the curve fits in floats: the chart spec must be valid JSON, which
+    has no NaN or Infinity.
+    """
+    if not (_real(a) and _real(b) and _real(c)) or a == 0:
+        return None
+    try:
+        with np.errstate(over="ignore", invalid="ignore"):
+            p = _sample(a, b, c)
+    except (OverflowError, ZeroDivisionError):  # a underflows to 0.0 for 1e-400
+        return None
+    finite = np.isfinite([*p.vertex, *p.roots, *(p.complex_root or ())]).all()
+    return p if finite and np.isfinite(p.xs).all() and np.isfinite(p.ys).all() else None
+
+
+def _sample(a, b, c):
+    f = lambdify(x, a*x**2 + b*x + c, "numpy")
+    fa = float(a)
+    h = -float(b) / (2 * fa) + 0.0  # + 0.0 turns -0.0 into 0.0
+    # Signs come from the exact discriminant: in floats a repeated surd root,
+    # such as that of 3x² - 2√6x + 2, would split in two.
+    disc = b**2 - 4*a*c
+    if disc.is_zero:
+        sign = 0
+    else:
+        positive = disc.is_positive
+        sign = 1 if (float(disc) > 0 if positive is None else positive) else -1
+    spread = np.sqrt(abs(float(disc))) / (2 * abs(fa)) if sign else 0.0
+    if sign > 0:
+        roots = (h - spread, h + spread)
+    elif sign == 0:
+        roots = (h,)
+    else:
+        roots = ()
+    complex_root = (h, spread) if sign < 0 else None
+    vertex = (h, float(-disc / (4 * a)) + 0.0)
+    if spread == 0:
+        # Repeated root: show the curve rising one unit either side.
+        spread = 1 / np.sqrt(abs(fa))
+    half = MARGIN * spread
+
+    grid = h + half * np.linspace(-1.0, 1.0, GRID_POINTS)
+    offsets = half * CLUSTER_WIDTH * np.linspace(-1.0, 1.0, CLUSTER_POINTS)
+    clusters = [p + offsets for p in (h, *roots)]
+    xs = np.unique(np.concatenate([grid, *clusters, [h], roots]))
+    ys = np.broadcast_to(np.asarray(f(xs), dtype=float), xs.shape)
+    return Parabola(vertex, roots, complex_root, xs, ys)
+
+
+def _round(v):
+    return float(f"{v:.6g}")
+
+
+def chart_spec(p):
+    """Vega-Lite spec of a sampled parabola with its vertex and real roots marked."""
+    curve = [{"x": _round(u), "y": _round(v)} for u, v in zip(p.xs, p.ys)]
+    points = [{"point": "vertex", "x": _round(p.vertex[0]), "y": _round(p.vertex[1])}]
+    points += [{"point": "root", "x": _round(r), "y": 0.0} for r in p.roots]
+    axis = {"field": "x", "type": "quantitative", "title": "x"}
+    value = {"field": "y", "type": "quantitative", "title": "y"}
+    return {
+        "height": 340,
+        "layer": [
+            {
+                "data": {"values": [{"y": 0.0}]},
+                "mark": {"type": "rule", "color": "#808080"},
+                "encoding": {"y": value},
+            },
+            {
+                "data": {"values": curve},
+                "mark": {"type": "line", "color": CURVE_COLOUR, "strokeWidth": 3},
+                "encoding": {"x": axis, "y": value},
+                "params": [{"name": "zoom", "select": "interval", "bind": "scales"}],
+            },
+            {
+                "data": {"values": points},
+                "mark": {"type": "point", "filled": True, "size": 110, "opacity": 1},
+                "encoding": {
+                    "x": axis,
+                    "y": value,
+                    "color": {
+                        "field": "point",
+                        "type": "nominal",
+                        "title": None,
+                        "scale": {"domain": ["vertex", "root"], "range": [VERTEX_COLOUR, ROOT_COLOUR]},
+                    },
+                    "tooltip": [
+                        {"field": "point", "type": "nominal"},
+                        {"field": "x", "type": "quantitative", "format": ".6~g"},
+                        {"field": "y", "type": "quantitative", "format": ".6~g"},
+                    ],
+                },
+            },
+        ],
+    }
+
+
+def caption(p):
+    """One line describing what the graph shows."""
+    h, k = p.vertex
+    text = f"Vertex at ({h:.6g}, {k:.6g})."
+    if p.complex_root is not None:
+        re_part, im_part = p.complex_root
+        return (f"{text} The parabola never crosses the x-axis: the roots are complex, "
+                f"x = {re_part:.6g} ± {im_part:.6g}i.")
+    if len(p.roots) == 1:
+        return f"{text} The parabola touches the x-axis at its vertex: one repeated root."
+    return f"{text} Real roots at x = {p.roots[0]:.6g} and x = {p.roots[1]:.6g}."
+
+
+def parabola_chart(a, b, c):
+    """Return ``(spec, caption)`` for the coefficients, or None if they cannot be plotted."""
+    p = sample(a, b, c)
+    if p is None:
+        return None
+    return chart_spec(p), caption(p)
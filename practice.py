@@ -0,0 +1,228 @@
+"""Practice problem generator for tutors.
+
+Problems are built backwards from their roots: pick roots of the requested
+kind, multiply out ``a(x - r₁)(x - r₂)`` with the denominators cleared, and
+the coefficients are known to be valid without solving anything. Each
+candidate is vetted with an O(1) discriminant check so that its kind
+matches what was asked for, and repeats are dropped by a set of triple
+hashes. ``generate`` is a generator, so a set of any size is streamed row by
+row; only the hash set grows with it.
+
+Every kind can be solved with the quadratic formula taught in the app, and
+the factorable kinds (``integer``, ``rational``, ``repeated``) also by
+splitting the middle term. The output uses the same ``a, b, c`` columns as
+the bulk worksheet upload:
+
+    python practice.py integer --count 50 --level easy
+    python practice.py surd --count 100000 --level challenge --output surds.csv
+"""
+import argparse
+import csv
+import io
+import random
+import sys
+from dataclasses import dataclass
+from math import gcd, isqrt
+
+KINDS = ("integer", "rational", "repeated", "surd", "complex")
+
+# Consecutive duplicates after which the problem space counts as used up.
+MAX_MISSES = 2000
+
+
+@dataclass(frozen=True, slots=True)
+class Level:
+    # Largest |numerator| of a root (or of the centre of surd and complex roots).
+    roots: int
+    # Largest leading factor multiplying a monic integer-root problem.
+    lead: int
+    # Largest denominator of a rational root or root centre.
+    denominator: int
+    # Largest square-free radicand of surd roots, and coefficient of i for complex ones.
+    radicand: int
+
+
+LEVELS = {
+    "easy": Level(roots=9, lead=1, denominator=1, radicand=7),
+    "medium": Level(roots=12, lead=4, denominator=3, radicand=15),
+    "hard": Level(roots=20, lead=9, denominator=6, radicand=30),
+    # Sets of 100,000 for every kind but repeated roots, which run out near 45,000.
+    "challenge": Level(roots=100, lead=20, denominator=12, radicand=60),
+}
+
+
+@dataclass(frozen=True, slots=True)
+class Problem:
+    a: int
+    b: int
+    c: int
+    kind: str
+
+    @property
+    def texts(self):
+        """The coefficients as the text the solver inputs take."""
+        return str(self.a), str(self.b), str(self.c)
+
+    @property
+    def discriminant(self):
+        return self.b * self.b - 4 * self.a * self.c
+
+    @property
+    def equation(self):
+        """Plain-text equation, e.g. ``2x² - 7x + 3 = 0``."""
+        text = "x²" if self.a == 1 else f"{self.a}x²"
+        for value, power in ((self.b, "x"), (self.c, "")):
+            if value:
+                magnitude = abs(value)
+                term = power if magnitude == 1 and power else f"{magnitude}{power}"
+                text += f" {'-' if value < 0 else '+'} {term}"
+        return f"{text} = 0"
+
+
+def _square_free(limit):
+    return [n for n in range(2, limit + 1) if all(n % (p * p) for p in range(2, isqrt(n) + 1))]
+
+
+def _nonzero(rng, bound):
+    return rng.randint(1, bound) * rng.choice((-1, 1))
+
+
+def _reduced(a, b, c):
+    g = gcd(a, b, c)
+    if a < 0:
+        g = -g
+    return a // g, b // g, c // g
+
+
+def _integer(rng, level, radicands):
+    r1, r2 = rng.randint(-level.roots, level.roots), rng.randint(-level.roots, level.roots)
+    k = rng.randint(1, level.lead)
+    # k(x - r1)(x - r2); keeping k leaves a common factor to take out first.
+    return k, -k * (r1 + r2), k * r1 * r2
+
+
+def _rational(rng, level, radicands):
+    q1, q2 = rng.randint(1, level.denominator), rng.randint(2, max(2, level.denominator))
+    p1, p2 = rng.randint(-level.roots, level.roots), _nonzero(rng, level.roots)
+    # (q1·x - p1)(q2·x - p2)
+    return _reduced(q1 * q2, -(q1 * p2 + q2 * p1), p1 * p2)
+
+
+def _repeated(rng, level, radicands):
+    q, p = rng.randint(1, level.denominator), rng.randint(-level.roots, level.roots)
+    k = rng.randint(1, level.lead)
+    # k(q·x - p)²
+    return k * q * q, -2 * k * q * p, k * p * p
+
+
+def _surd(rng, level, radicands):
+    d, m, n = rng.randint(1, level.denominator), rng.randint(-level.roots, level.roots), rng.randint(1, 3)
+    s = rng.choice(radicands)
+    # Roots (m ± n√s)/d: (d·x - m)² - n²s
+    return _reduced(d * d, -2 * d * m, m * m - n * n * s)
+
+
+def _complex(rng, level, radicands):
+    d, m, n = rng.randint(1, level.denominator), rng.randint(-level.roots, level.roots), \
+        rng.randint(1, level.radicand)
+    # Roots (m ± n·i)/d: (d·x - m)² + n²
+    return _reduced(d * d, -2 * d * m, m * m + n * n)
+
+
+_BUILDERS = {
+    "integer": _integer,
+    "rational": _rational,
+    "repeated": _repeated,
+    "surd": _surd,
+    "complex": _complex,
+}
+
+
+def _vetted(kind, a, b, c):
+    disc = b * b - 4 * a * c
+    if kind == "repeated":
+        return disc == 0
+    if kind == "complex":
+        return disc < 0
+    if disc <= 0:
+        return False
+    root = isqrt(disc)
+    square = root * root == disc
+    if kind == "surd":
+        return not square
+    if not square:
+        return False
+    # Factorable: integer roots need 2a | -b ± √Δ; rational ones need at least one that is not.
+    integral = (-b + root) % (2 * a) == 0 and (-b - root) % (2 * a) == 0
+    return integral if kind == "integer" else not integral
+
+
+def generate(kind="integer", level="easy", count=None, seed=None):
+    """Yield up to ``count`` distinct problems of ``kind`` (endless if ``count`` is None).
+
+    Stops early once ``MAX_MISSES`` candidates in a row are repeats, which
+    means the level's problem space is nearly used up.
+    """
+    try:
+        build = _BUILDERS[kind]
+        params = LEVELS[level]
+    except KeyError as e:
+        raise ValueError(f"Unknown practice kind or level: {e.args[0]!r}") from None
+    rng = random.Random(seed)
+    radicands = _square_free(params.radicand)
+    seen = set()
+    produced = misses = 0
+    while count is None or produced < count:
+        a, b, c = build(rng, params, radicands)
+        key = hash((a, b, c))
+        if key in seen or not _vetted(kind, a, b, c):
+            misses += 1
+            if misses >= MAX_MISSES:
+                return
+            continue
+        seen.add(key)
+        misses = 0
+        produced += 1
+        yield Problem(a, b, c, kind)
+
+
+def write_csv(problems, f):
+    """Stream problems to ``f`` as CSV with an ``a,b,c,kind`` header; returns the row count."""
+    writer = csv.writer(f)
+    writer.writerow(["a", "b", "c", "kind"])
+    rows = 0
+    for p in problems:
+        writer.writerow((p.a, p.b, p.c, p.kind))
+        rows += 1
+    return rows
+
+
+def to_csv(problems):
+    buffer = io.StringIO()
+    write_csv(problems, buffer)
+    return buffer.getvalue()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate practice quadratics with known roots.")
+    parser.add_argument("kind", choices=KINDS)
+    parser.add_argument("--level", choices=list(LEVELS), default="easy")
+    parser.add_argument("--count", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--output", help="CSV file to write (default: stdout)")
+    args = parser.parse_args(argv)
+
+    problems = generate(args.kind, args.level, args.count, args.seed)
+    if args.output:
+        with open(args.output, "w", newline="") as f:
+            rows = write_csv(problems, f)
+    else:
+        rows = write_csv(problems, sys.stdout)
+    if rows < args.count:
+        print(f"stopped after {rows} problems: level {args.level} has few distinct {args.kind} problems left",
+              file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
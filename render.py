@@ -0,0 +1,91 @@
+"""Streamlit renderer for the step model built in ``steps.py``."""
+import streamlit as st
+
+import metrics
+from solver import canonical_key
+from steps import get_section
+
+CARD_OPEN = """<div style='background-color: white; padding: 40px; border-radius: 10px; color: black;'>"""
+CARD_CLOSE = "</div>"
+FINAL_ANSWER_HTML = '<div style="background-color: #1a4d2e; padding: 20px; border-radius: 10px; margin: 15px 0; border: 2px solid #27ae60;"><p style="color: #27ae60; font-size: 22px; font-weight: bold; margin: 0;">✅ Final Answer:</p></div>'
+
+
+def render_step(step, out=st):
+    kind = step.kind
+    if kind == "latex":
+        out.latex(step.content)
+    elif kind == "write":
+        out.write(step.content)
+    elif kind == "markdown":
+        out.markdown(step.content)
+    elif kind == "info":
+        out.info(step.content)
+    elif kind == "success":
+        out.success(step.content)
+    elif kind == "answer":
+        out.markdown(FINAL_ANSWER_HTML, unsafe_allow_html=True)
+    elif kind == "divider":
+        out.markdown("---")
+    else:
+        raise ValueError(f"Unknown step kind: {kind!r}")
+
+
+def render_section(steps, out=st):
+    """Render one method inside the white solution card."""
+    with out.container():
+        out.markdown(CARD_OPEN, unsafe_allow_html=True)
+        for step in steps:
+            render_step(step, out)
+        out.markdown(CARD_CLOSE, unsafe_allow_html=True)
+
+
+METHODS = {
+    "📗 Method 1: Splitting the Middle Term": "method1",
+    "📕 Method 2: Quadratic Formula": "method2",
+    "✅ Verification": "verification",
+}
+
+
+@st.fragment
+def solution_view(solution):
+    """Show one method at a time; switching methods reruns only this fragment."""
+    label = st.segmented_control(
+        "Show", list(METHODS), default=next(iter(METHODS)), key="method", label_visibility="collapsed"
+    )
+    if label is None:
+        st.caption("Pick a method above to see the step-by-step solution.")
+        return
+    # On its own reruns the fragment is measured as a request of its own.
+    with metrics.request("method view"):
+        try:
+            with metrics.stage("steps"):
+                section = get_section(solution, METHODS[label])
+            with metrics.stage("render"):
+                st.markdown(f"## {label}")
+                render_section(section)
+        except Exception as e:
+            st.error(f"Error: {str(e)}")
+
+
+@st.cache_data(max_entries=512, show_spinner=False)
+def _graph(key, _a, _b, _c):
+    # Keyed on the canonical triple alone; the sympy values are not hashed.
+    from plot import parabola_chart  # NumPy is only loaded once a graph is drawn
+
+    return parabola_chart(_a, _b, _c)
+
+
+def graph_view(solution):
+    """Plot y = ax² + bx + c with its vertex and real roots."""
+    with metrics.stage("plot"):
+        # A graph that cannot be drawn must not take the methods below with it.
+        try:
+            chart = _graph(canonical_key(solution.a, solution.b, solution.c), solution.a, solution.b, solution.c)
+        except Exception:
+            chart = None
+        if chart is None:
+            st.caption("The graph is drawn for real numeric coefficients of moderate size only.")
+            return
+        spec, caption = chart
+        st.vega_lite_chart(spec, use_container_width=True)
+        st.caption(caption)
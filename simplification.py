@@ -0,0 +1,230 @@
+"""Cheap, targeted simplification of the expressions a quadratic produces.
+
+``sympy.simplify`` tries every rewrite it knows and keeps the shortest
+result, which costs tens of milliseconds even for ``(1 - sqrt(2))**2``.
+The solver only ever simplifies roots, discriminants and the terms of the
+verification sum ``a·r² + b·r + c``, so ``quick_simplify`` handles those
+shapes directly:
+
+* Numbers built from rationals, ``I`` and square roots of integers are
+  evaluated exactly in ``Fraction`` arithmetic as ``Σ qᵢ·√sᵢ`` with
+  square-free ``sᵢ``, rationalizing denominators on the way. The result is
+  the expanded normal form, so a verification sum that is zero comes out as
+  exactly ``0``.
+* Other numbers (nested radicals, ``pi``, …) get ``sqrtdenest``, ``radsimp``
+  and ``expand``. A result that is numerically zero but not structurally
+  zero is handed to ``simplify`` to prove it.
+* Symbolic expressions that are already expanded are returned unchanged;
+  others are expanded, and only put over a common denominator when a sum
+  appears in a denominator.
+
+Every pass is bounded by the size of the expression, the answer is memoized,
+and the original is kept whenever a rewrite does not make it smaller.
+"""
+from fractions import Fraction
+from functools import lru_cache
+from math import gcd
+
+from sympy import Add, I, Integer, Pow, Rational, S, cancel, expand, preorder_traversal, radsimp, \
+    simplify, sqrt, sqrtdenest, together
+
+# Expressions larger than this (in tree nodes) skip the costlier passes.
+MAX_NODES = 400
+# Only expressions this small are worth a full ``simplify`` as a last resort.
+FALLBACK_NODES = 80
+# Largest integer power expanded by repeated multiplication.
+MAX_POWER = 16
+# Radicals one exact value may carry before it stops being cheap.
+MAX_RADICALS = 8
+ZERO_DIGITS = 30
+
+
+class _Unsupported(Exception):
+    pass
+
+
+def _size(expr):
+    count = 0
+    for _ in preorder_traversal(expr):
+        count += 1
+        if count > MAX_NODES:
+            break
+    return count
+
+
+# ---------- exact surd arithmetic ----------
+#
+# A value is a dict {radicand: Fraction} meaning Σ coeff·√radicand, with every
+# radicand a square-free integer: 1 for the rational part and a negative
+# radicand s for i·√|s|.
+
+def _radical_product(s, t):
+    """Return (factor, radicand) with √s·√t == factor·√radicand."""
+    sign = -1 if s < 0 and t < 0 else 1
+    g = gcd(s, t)
+    radicand = (abs(s) // g) * (abs(t) // g)
+    if (s < 0) != (t < 0):
+        radicand = -radicand
+    return sign * g, radicand
+
+
+def _mul(u, v):
+    out = {}
+    for s, p in u.items():
+        for t, q in v.items():
+            factor, radicand = _radical_product(s, t)
+            out[radicand] = out.get(radicand, 0) + factor * p * q
+    out = {s: q for s, q in out.items() if q}
+    if len(out) > MAX_RADICALS:
+        raise _Unsupported
+    return out
+
+
+def _inverse(u):
+    if not u:
+        raise ZeroDivisionError
+    if len(u) == 1:
+        (s, q), = u.items()
+        # 1/(q·√s) = √s/(q·s); this also holds for s < 0, where √s is i·√|s|.
+        return {s: 1 / (q * s)}
+    rest = {s: q for s, q in u.items() if s != 1}
+    if len(rest) != 1:
+        raise _Unsupported
+    # 1/(p + q·√s) = (p - q·√s)/(p² - q²·s)
+    (s, q), = rest.items()
+    p = u.get(1, 0)
+    norm = p * p - q * q * s
+    return {1: p / norm, s: -q / norm}
+
+
+def _power(u, n):
+    if abs(n) > MAX_POWER:
+        raise _Unsupported
+    result = {1: Fraction(1)}
+    base = u if n >= 0 else _inverse(u)
+    for _ in range(abs(n)):
+        result = _mul(result, base)
+    return result
+
+
+def _surd(expr, radicals):
+    if expr.is_Rational:
+        return {1: Fraction(int(expr.p), int(expr.q))} if expr else {}
+    if expr is I:
+        return {-1: Fraction(1)}
+    if expr.is_Add:
+        out = {}
+        for arg in expr.args:
+            for s, q in _surd(arg, radicals).items():
+                out[s] = out.get(s, 0) + q
+        return {s: q for s, q in out.items() if q}
+    if expr.is_Mul:
+        out = {1: Fraction(1)}
+        for arg in expr.args:
+            out = _mul(out, _surd(arg, radicals))
+        return out
+    if expr.is_Pow:
+        base, exp = expr.args
+        if exp.is_Integer:
+            return _power(_surd(base, radicals), int(exp))
+        if exp.is_Rational and exp.q == 2 and base.is_Integer and base > 0:
+            # sympy keeps √n square-free except for factors it could not find;
+            # those stay exact, they just may not combine with their cofactor.
+            radicals[int(base)] = Pow(base, S.Half)
+            return _power({int(base): Fraction(1)}, int(exp.p))
+    raise _Unsupported
+
+
+def _radical(s, radicals):
+    if s == 1:
+        return S.One
+    if s == -1:
+        return I
+    # Reuse the input's radicals: building √n anew makes sympy factor n again.
+    root = radicals.get(abs(s))
+    if root is None:
+        root = sqrt(Integer(abs(s)))
+    return root if s > 0 else I * root
+
+
+def _from_surd(u, radicals):
+    return Add(*(Rational(q.numerator, q.denominator) * _radical(s, radicals) for s, q in sorted(u.items())))
+
+
+# ---------- general passes ----------
+
+def _numerically_zero(expr):
+    try:
+        value = expr.evalf(ZERO_DIGITS)
+    except (TypeError, ValueError):
+        return False
+    return value.is_number and abs(value) < 10 ** -(ZERO_DIGITS - 5)
+
+
+def _has_nested_radical(expr):
+    return any(p.is_Pow and p.exp.is_Rational and not p.exp.is_Integer and not p.base.is_Atom
+               for p in preorder_traversal(expr))
+
+
+def _has_sum_denominator(expr):
+    return any(p.is_Pow and p.exp.is_negative and p.base.is_Add for p in preorder_traversal(expr))
+
+
+def _is_expanded(expr):
+    """True if ``expand`` has nothing to distribute.
+
+    At the top level a single sum times a monomial, such as
+    ``-(k + sqrt(k**2 - 4))/2``, also counts: that is the factored form
+    ``simplify`` itself prefers.
+    """
+    for node in preorder_traversal(expr):
+        if node.is_Pow and node.base.is_Add and node.exp.is_Integer and node.exp > 1:
+            return False
+        if node.is_Mul and sum(1 for arg in node.args if arg.is_Add) > (node is expr):
+            return False
+    return True
+
+
+def _smaller(candidate, expr):
+    return candidate if _size(candidate) < _size(expr) else expr
+
+
+def _numeric(expr, size):
+    candidate = expr
+    if size <= MAX_NODES:
+        if _has_nested_radical(candidate):
+            candidate = sqrtdenest(candidate)
+        if _has_sum_denominator(candidate):
+            candidate = radsimp(candidate)
+        candidate = expand(candidate)
+    if candidate != 0 and size <= FALLBACK_NODES and _numerically_zero(candidate):
+        candidate = simplify(candidate)
+    return candidate if candidate == 0 else _smaller(candidate, expr)
+
+
+def _symbolic(expr, size):
+    if size > MAX_NODES or _is_expanded(expr):
+        return expr
+    candidate = expand(expr)
+    if _has_sum_denominator(candidate):
+        candidate = cancel(together(candidate))
+    return candidate if candidate == 0 else _smaller(candidate, expr)
+
+
+@lru_cache(maxsize=4096)
+def quick_simplify(expr):
+    """Simplify a root, discriminant or verification term of a quadratic.
+
+    Returns an expression equal in value to ``simplify(expr)``; numbers come
+    back in expanded form, e.g. ``3 - 2*sqrt(2)`` for ``(1 - sqrt(2))**2``.
+    """
+    if expr.is_Atom:
+        return expr
+    if expr.is_number:
+        radicals = {}
+        try:
+            return _from_surd(_surd(expr, radicals), radicals)
+        except (_Unsupported, ZeroDivisionError):
+            pass
+    size = _size(expr)
+    return _numeric(expr, size) if expr.is_number else _symbolic(expr, size)
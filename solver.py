@@ -0,0 +1,231 @@
+"""Solver core for ax² + bx + c = 0, kept free of any Streamlit calls.
+
+Streamlit re-executes ``app.py`` on every interaction, but imported modules
+stay loaded in the worker process, so the cache below is shared by every
+rerun and every session served by that worker.
+"""
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from fractions import Fraction
+from math import isqrt
+
+from sympy import I, N, Rational, default_sort_key, solve, sqrt, srepr, symbols, sympify
+
+import metrics
+from simplification import quick_simplify
+
+x = symbols('x')
+
+TRIAL_LIMIT = 1 << 16
+# sympy factors the radicand (an isprime test on whatever trial division
+# leaves) whenever the root is built or re-evaluated; past this size that
+# takes seconds.
+MAX_RADICAND_DIGITS = 600
+
+
+class RadicandTooLargeError(ValueError):
+    """The roots would need the square root of an impractically large integer."""
+
+
+@dataclass(frozen=True)
+class Solution:
+    a: object
+    b: object
+    c: object
+    equation: object
+    roots: list
+    unique_roots: list
+    discriminant: object
+
+
+def canonical_key(a, b, c):
+    """Return the cache key for a coefficient triple.
+
+    ``parse_expr`` already evaluates inputs such as "2/4" and "1/2" to the
+    same ``Rational``, so the structural ``srepr`` of each coefficient is a
+    stable, hashable canonical form.
+    """
+    return tuple(srepr(sympify(v)) for v in (a, b, c))
+
+
+def _exact_sqrt(n):
+    """Return the integer square root of ``n`` if it is a perfect square."""
+    root = isqrt(n)
+    return root if root * root == n else None
+
+
+def _split_square(n):
+    """Write a positive integer as ``outside**2 * inside`` with ``inside`` square-free.
+
+    Trial division only has to run up to the cube root: whatever is left
+    after that has at most two prime factors, so it is either a perfect
+    square or already square-free. Divisors are capped at ``TRIAL_LIMIT`` so
+    huge inputs stay cheap; past the cap ``inside`` may keep a square factor,
+    which is still exact and which sympy's ``sqrt`` pulls out later.
+    """
+    outside, inside = 1, 1
+    p = 2
+    while p * p * p <= n and p <= TRIAL_LIMIT:
+        if n % p == 0:
+            count = 0
+            while n % p == 0:
+                n //= p
+                count += 1
+            outside *= p ** (count // 2)
+            if count % 2:
+                inside *= p
+        p += 1 if p == 2 else 2
+    root = _exact_sqrt(n)
+    if root is not None:
+        outside *= root
+    else:
+        inside *= n
+    return outside, inside
+
+
+def surd_roots(fa, fb, fc):
+    """Closed-form roots of a quadratic with ``Fraction`` coefficients.
+
+    Returns ``(disc, centre, coeff, radicand)`` such that the roots are
+    ``centre ± coeff*sqrt(radicand)``, where ``coeff >= 0`` and ``radicand``
+    is a square-free integer (negative for complex roots, 0 when the root is
+    repeated and ±1 when no radical is left).
+    """
+    disc = fb * fb - 4 * fa * fc
+    centre = -fb / (2 * fa)
+    if disc == 0:
+        return disc, centre, Fraction(0), 0
+    # sqrt(p/q) = sqrt(p*q)/q, and p*q is split into a square part and the rest.
+    outside, inside = _split_square(abs(disc.numerator) * disc.denominator)
+    coeff = Fraction(outside, disc.denominator * 2 * abs(fa))
+    return disc, centre, coeff, inside if disc > 0 else -inside
+
+
+def _to_rational(f):
+    return Rational(f.numerator, f.denominator)
+
+
+def _solve_rational(a, b, c):
+    """Closed-form roots for rational coefficients, in deterministic order.
+
+    Real roots come out in ascending order and complex conjugates with the
+    negative imaginary part first, which is also how ``sympy.solve`` lists
+    them. Only irrational square roots are left to sympy to build, and only
+    up to ``MAX_RADICAND_DIGITS``.
+    """
+    fa, fb, fc = (Fraction(int(v.p), int(v.q)) for v in (a, b, c))
+    disc, centre, coeff, radicand = surd_roots(fa, fb, fc)
+
+    if radicand == 0:
+        return [_to_rational(centre)], _to_rational(disc)
+    if radicand == 1:
+        return [_to_rational(centre - coeff), _to_rational(centre + coeff)], _to_rational(disc)
+    if len(str(abs(radicand))) > MAX_RADICAND_DIGITS:
+        raise RadicandTooLargeError(
+            f"The roots involve the square root of a number with more than {MAX_RADICAND_DIGITS} digits.")
+
+    half = _to_rational(coeff)
+    if radicand == -1:
+        half = half * I
+    elif radicand > 0:
+        half = half * sqrt(radicand)
+    else:
+        half = half * I * sqrt(-radicand)
+    centre = _to_rational(centre)
+    return [centre - half, centre + half], _to_rational(disc)
+
+
+def _root_order(r):
+    """Sort numeric roots by (real, imaginary) value, symbolic ones last."""
+    if r.is_number:
+        re_part, im_part = N(r).as_real_imag()
+        return (0, float(re_part), float(im_part), default_sort_key(r))
+    return (1, 0.0, 0.0, default_sort_key(r))
+
+
+def _solve_symbolic(a, b, c, equation):
+    """Generic sympy path for surds, symbols and complex coefficients."""
+    roots = solve(equation, x)
+    unique_roots = list(dict.fromkeys(quick_simplify(r) for r in roots))
+    unique_roots.sort(key=_root_order)
+    discriminant = quick_simplify(b**2 - 4*a*c)
+    return roots, unique_roots, discriminant
+
+
+def compute_solution(a, b, c):
+    """Solve the quadratic from scratch, without consulting any cache."""
+    a, b, c = sympify(a), sympify(b), sympify(c)
+    if a == 0:
+        raise ValueError("Coefficient 'a' cannot be zero for a quadratic equation!")
+
+    equation = a*x**2 + b*x + c
+    if a.is_Rational and b.is_Rational and c.is_Rational:
+        roots, discriminant = _solve_rational(a, b, c)
+        unique_roots = list(roots)
+    else:
+        roots, unique_roots, discriminant = _solve_symbolic(a, b, c, equation)
+    return Solution(a, b, c, equation, roots, unique_roots, discriminant)
+
+
+class SolutionCache:
+    """Bounded LRU memo of solved problems with hit/miss counters."""
+
+    def __init__(self, maxsize=2048):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            try:
+                value = self._data[key]
+            except KeyError:
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key, value):
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self):
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "hit_rate": self.hits / total if total else 0.0,
+            }
+
+    def __len__(self):
+        return len(self._data)
+
+
+cache = SolutionCache()
+metrics.register_cache("solutions", cache)
+
+
+def solve_quadratic(a, b, c):
+    """Return the (possibly cached) ``Solution`` for ax² + bx + c = 0."""
+    key = canonical_key(a, b, c)
+    solution = cache.get(key)
+    if solution is None:
+        solution = compute_solution(a, b, c)
+        cache.put(key, solution)
+    return solution
@@ -0,0 +1,176 @@
+"""Cold-start helpers: background warm-up of the symbolic engine and a startup report.
+
+The report works like ``python -X importtime`` but is collected inside the
+running app: every module imported while the profiler is installed is timed
+(self and cumulative), and the named stages of the first script run are
+recorded next to it. Only the first run in a worker process is measured;
+later reruns find everything in ``sys.modules`` and cost nothing here.
+"""
+import importlib
+import logging
+import sys
+import threading
+from dataclasses import dataclass, field
+from time import perf_counter
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True, slots=True)
+class ImportRecord:
+    name: str
+    self_s: float
+    cumulative_s: float
+    depth: int
+
+
+@dataclass
+class StartupReport:
+    started_at: float = field(default_factory=perf_counter)
+    finished_at: float = None
+    stages: dict = field(default_factory=dict)
+    imports: list = field(default_factory=list)
+
+    @property
+    def finished(self):
+        return self.finished_at is not None
+
+    @property
+    def total_s(self):
+        end = self.finished_at if self.finished else perf_counter()
+        return end - self.started_at
+
+    def top_imports(self, n=15):
+        """Slowest top-level imports, by cumulative time."""
+        roots = [r for r in self.imports if r.depth == 0]
+        return sorted(roots, key=lambda r: r.cumulative_s, reverse=True)[:n]
+
+    def as_dict(self):
+        return {
+            "total_s": round(self.total_s, 6),
+            "stages": {name: round(s, 6) for name, s in self.stages.items()},
+            "imports": [
+                {"module": r.name, "self_s": round(r.self_s, 6), "cumulative_s": round(r.cumulative_s, 6)}
+                for r in self.top_imports()
+            ],
+        }
+
+    def to_text(self):
+        """Render the report in the same layout as ``-X importtime``."""
+        lines = [f"startup: {self.total_s * 1e3:.1f} ms total"]
+        for name, seconds in self.stages.items():
+            lines.append(f"stage: {seconds * 1e3:10.1f} ms | {name}")
+        lines.append("import time: self [us] | cumulative | imported package")
+        for r in self.imports:
+            lines.append(f"import time: {r.self_s * 1e6:9.0f} | {r.cumulative_s * 1e6:10.0f} | {'  ' * r.depth}{r.name}")
+        return "\n".join(lines)
+
+
+class _ImportTimer:
+    """Meta path finder that times ``exec_module`` of every module it sees.
+
+    It delegates the actual lookup to the other finders and only wraps the
+    returned loader, so import semantics are unchanged.
+    """
+
+    def __init__(self, report):
+        self.report = report
+        self._local = threading.local()
+
+    def _stack(self):
+        try:
+            return self._local.stack
+        except AttributeError:
+            self._local.stack = []
+            return self._local.stack
+
+    def find_spec(self, name, path, target=None):
+        for finder in sys.meta_path:
+            if finder is self or not hasattr(finder, "find_spec"):
+                continue
+            spec = finder.find_spec(name, path, target)
+            if spec is not None:
+                break
+        else:
+            return None
+
+        loader = spec.loader
+        # Builtin and frozen importers are classes shared by many modules.
+        if loader is None or isinstance(loader, type) or not hasattr(loader, "exec_module"):
+            return spec
+        exec_module = loader.exec_module
+
+        def timed_exec_module(module):
+            stack = self._stack()
+            stack.append(0.0)
+            start = perf_counter()
+            try:
+                exec_module(module)
+            finally:
+                elapsed = perf_counter() - start
+                children = stack.pop()
+                if stack:
+                    stack[-1] += elapsed
+                self.report.imports.append(ImportRecord(name, elapsed - children, elapsed, len(stack)))
+
+        loader.exec_module = timed_exec_module
+        return spec
+
+
+report = StartupReport()
+_timer = None
+_warmup = None
+_last_checkpoint = report.started_at
+_lock = threading.Lock()
+
+
+def warm_up(*modules):
+    """Install the import profiler and import ``modules`` in a background thread.
+
+    Call it at the top of every script run: it restarts the checkpoint clock,
+    but only the first call in a process installs the profiler and imports.
+    """
+    global _timer, _warmup, _last_checkpoint
+    with _lock:
+        _last_checkpoint = perf_counter()
+        if _warmup is not None:
+            return
+        _timer = _ImportTimer(report)
+        sys.meta_path.insert(0, _timer)
+
+        def load():
+            start = perf_counter()
+            for name in modules:
+                importlib.import_module(name)
+            report.stages["engine import (background)"] = perf_counter() - start
+
+        _warmup = threading.Thread(target=load, name="engine-warmup", daemon=True)
+        _warmup.start()
+
+
+def wait():
+    """Block until the background warm-up has finished importing."""
+    if _warmup is not None:
+        _warmup.join()
+
+
+def checkpoint(name):
+    """Record the time since the previous checkpoint as stage ``name``."""
+    global _last_checkpoint
+    now = perf_counter()
+    if not report.finished:
+        report.stages[name] = report.stages.get(name, 0.0) + now - _last_checkpoint
+    _last_checkpoint = now
+
+
+def finish():
+    """Close the report at the end of the first run and uninstall the profiler."""
+    with _lock:
+        if report.finished:
+            return
+        if _warmup is not None:
+            _warmup.join()
+        report.finished_at = perf_counter()
+        if _timer in sys.meta_path:
+            sys.meta_path.remove(_timer)
+    logger.info("Cold start report\n%s", report.to_text())
@@ -0,0 +1,375 @@
+"""Step-by-step solution model, built once per problem and free of Streamlit.
+
+``build_steps`` turns a ``solver.Solution`` into plain tuples of ``Step``
+records whose LaTeX has already been generated. Rendering them is left to
+``render.py``, so a built model can be cached, reused across reruns and
+inspected without a running Streamlit app.
+"""
+from dataclasses import dataclass
+from fractions import Fraction
+
+from sympy import Rational, expand, latex
+
+import metrics
+from factor_pairs import find_split
+from simplification import quick_simplify
+from solver import SolutionCache, canonical_key, x
+from store import results
+
+
+@dataclass(frozen=True, slots=True)
+class Step:
+    # One of: "markdown", "write", "latex", "info", "success", "answer", "divider".
+    kind: str
+    content: str = ""
+
+
+@dataclass(frozen=True, slots=True)
+class SolutionSteps:
+    equation_latex: str
+    method1: tuple
+    method2: tuple
+    verification: tuple
+
+
+class _LatexCache:
+    """Convert each distinct expression to LaTeX exactly once."""
+
+    __slots__ = ("_seen",)
+
+    def __init__(self):
+        self._seen = {}
+
+    def __call__(self, expr):
+        try:
+            return self._seen[expr]
+        except KeyError:
+            with metrics.stage("latex"):
+                text = self._seen[expr] = latex(expr)
+            return text
+
+
+def _simplified(expr):
+    # Rational results are already in canonical form; simplifying would only
+    # burn time confirming that.
+    if expr.is_Rational:
+        return expr
+    with metrics.stage("simplify"):
+        return quick_simplify(expr)
+
+
+def _conclusion(s, tex, add):
+    unique_roots = s.unique_roots
+    if len(unique_roots) < len(s.roots):
+        add(Step("info", "**Note:** This root is repeated twice."))
+
+    add(Step("write", "**Therefore, the roots of the equation are:**"))
+    if len(unique_roots) == 1:
+        lr = tex(unique_roots[0])
+        add(Step("latex", f"x = {lr}, \\quad x = {lr}"))
+        add(Step("answer"))
+        add(Step("latex", f"x = {lr} \\text{{ (repeated twice)}}"))
+    else:
+        for root in unique_roots:
+            add(Step("latex", f"x = {tex(root)}"))
+        add(Step("answer"))
+        add(Step("latex", ", \\quad ".join([f"x = {tex(r)}" for r in unique_roots])))
+
+
+def _method1(s, tex):
+    steps = []
+    add = steps.append
+
+    add(Step("markdown", "### Example: Find the roots of the quadratic equation"))
+    add(Step("latex", f"{tex(s.equation)} = 0"))
+    add(Step("markdown", "### Solution:"))
+
+    if s.a.is_Rational and s.b.is_Rational and s.c.is_Rational:
+        split = find_split(*(Fraction(int(v.p), int(v.q)) for v in (s.a, s.b, s.c)))
+        _split_integer(s, tex, add, split)
+    else:
+        _split_from_roots(s, tex, add)
+
+    _conclusion(s, tex, add)
+    return tuple(steps)
+
+
+def _split_integer(s, tex, add, split):
+    """Steps 1-8 for rational coefficients, driven by the factor-pair search."""
+    a, b, c, product = split.a, split.b, split.c, split.product
+    step = 0
+
+    def heading(text):
+        nonlocal step
+        step += 1
+        add(Step("write", f"**Step {step}:** {text}"))
+
+    if split.scale != 1:
+        heading(f"Clear the fractions by multiplying every term by {split.scale}:")
+        add(Step("latex", f"{tex(a*x**2 + b*x + c)} = 0"))
+
+    heading("For the equation")
+    add(Step("latex", f"{a}x^2 + ({b})x + {c} = 0"))
+
+    heading("Find two numbers whose product = a × c and sum = b")
+    add(Step("write", "Product:"))
+    add(Step("latex", f"{a} \\times {c} = {product}"))
+    add(Step("write", "Sum:"))
+    add(Step("latex", f"{b}"))
+
+    if split.candidates:
+        heading(f"List the factor pairs of {product} and add each pair:")
+        add(Step("markdown", "  \n".join(
+            f"• {p} × {q}: sum = {p + q}" + (" ✓" if (p, q) == split.pair else "")
+            for p, q in split.candidates
+        )))
+
+    if not split.factorable:
+        if split.candidates:
+            add(Step("write", f"None of these pairs adds up to {b}."))
+        else:
+            add(Step("write", f"No two integers multiply to {product} and add up to {b}."))
+        add(Step("write", "Check: the discriminant is not a perfect square, so no such pair exists:"))
+        add(Step("latex", f"b^2 - 4ac = {split.discriminant}"))
+        add(Step("info", "This equation is **not factorable over the integers**, so the middle term cannot be "
+                         "split. Use the quadratic formula (Method 2) instead."))
+        add(Step("write", "The quadratic formula gives:"))
+        return
+
+    p, q = split.pair
+    (g1, g2), (a1, p1) = split.factors
+    binomial, other = tex(a1*x + p1), tex(g1*x + g2)
+    add(Step("write", f"The two numbers are {p} and {q}."))
+
+    heading("Split the middle term:")
+    add(Step("latex", f"= {a}x^2 + ({p})x + ({q})x + {c}"))
+
+    heading("Group the terms:")
+    add(Step("latex", f"= ({tex(a*x**2 + p*x)}) + ({tex(q*x + c)})"))
+
+    heading("Factor out common terms from each group:")
+    if g2 == 0:
+        add(Step("latex", f"= {tex(g1*x)}({binomial})"))
+    else:
+        sign = "+" if g2 > 0 else "-"
+        add(Step("latex", f"= {tex(g1*x)}({binomial}) {sign} {abs(g2)}({binomial})"))
+
+    heading(f"Take out the common factor ({binomial}):")
+    repeated = g1 * p1 == g2 * a1
+    if repeated:
+        lead = Rational(g1, a1)
+        lead = "" if lead == 1 else "-" if lead == -1 else tex(lead)
+        factored = f"{lead}({binomial})^2"
+    elif g2 == 0:
+        factored = f"{other}({binomial})"
+    else:
+        factored = f"({other})({binomial})"
+    add(Step("latex", f"= {factored}"))
+
+    heading("Set the equation equal to zero:")
+    add(Step("latex", f"{factored} = 0"))
+    r1, r2 = split.roots
+    if repeated:
+        add(Step("write", "Taking square root of both sides:"))
+        add(Step("latex", f"{binomial} = 0"))
+        heading("Solve for x:")
+        add(Step("latex", f"x = {tex(Rational(r2.numerator, r2.denominator))}"))
+    else:
+        add(Step("write", "By zero product property, at least one factor must be zero"))
+        heading("Solve for x:")
+        add(Step("write", f"**From first factor:** {other} = 0"))
+        add(Step("latex", f"x = {tex(Rational(r1.numerator, r1.denominator))}"))
+        add(Step("write", ""))
+        add(Step("write", f"**From second factor:** {binomial} = 0"))
+        add(Step("latex", f"x = {tex(Rational(r2.numerator, r2.denominator))}"))
+
+
+def _split_from_roots(s, tex, add):
+    """Steps 1-8 for surd or symbolic coefficients, where the split comes from the roots."""
+    a, b, c = s.a, s.b, s.c
+    unique_roots = s.unique_roots
+    la, lb, lc = tex(a), tex(b), tex(c)
+
+    add(Step("write", "**Step 1:** For the equation"))
+    add(Step("latex", f"{la}x^2 + ({lb})x + {lc} = 0"))
+
+    add(Step("write", "**Step 2:** Find two numbers whose product = a × c and sum = b"))
+    add(Step("write", "Product:"))
+    add(Step("latex", f"{la} \\times {lc} = {tex(expand(a * c))}"))
+    add(Step("write", "Sum:"))
+    add(Step("latex", f"{lb}"))
+
+    # Step 3: Split the middle term based on actual roots
+    add(Step("write", "**Step 3:** Split the middle term:"))
+    add(Step("write", "We need to find two numbers that:"))
+    add(Step("write", "• Multiply to give a × c"))
+    add(Step("write", "• Add up to give b"))
+
+    # For a(x - r1)(x - r2) = ax² - a(r1+r2)x + a·r1·r2,
+    # so b = -a(r1+r2) splits as -a·r1 and -a·r2.
+    r1 = unique_roots[0]
+    r2 = unique_roots[1] if len(unique_roots) == 2 else r1
+    b_part1, b_part2 = -r1 * a, -r2 * a
+    if len(unique_roots) == 1:
+        add(Step("write", f"The two numbers are both {tex(b_part1)}"))
+    add(Step("latex", f"= {la}x^2 + ({tex(b_part1)})x + ({tex(b_part2)})x + {lc}"))
+    term1 = a*x**2 + b_part1*x
+    term2 = b_part2*x + c
+
+    add(Step("write", "**Step 4:** Group the terms:"))
+    add(Step("latex", f"= ({tex(term1)}) + ({tex(term2)})"))
+
+    # Step 5: Factor each group; both groups share the factor (x - r1)
+    lr1, lr2 = tex(r1), tex(r2)
+    lb1, lb2 = tex(x - r1), tex(x - r2)
+    add(Step("write", "**Step 5:** Factor out common terms from each group:"))
+    add(Step("latex", f"= {tex(a*x)}({lb1}) + ({tex(b_part2)})({lb1})"))
+
+    add(Step("write", f"**Step 6:** Notice the common binomial factor ({lb1}) and factor it out:"))
+    lead = "" if a == 1 else la
+    factored = f"{lead}({lb1})^2" if len(unique_roots) == 1 else f"{lead}({lb1})({lb2})"
+    add(Step("latex", f"= {factored}"))
+
+    add(Step("write", "**Step 7:** Set the equation equal to zero:"))
+    add(Step("latex", f"{factored} = 0"))
+    if len(unique_roots) == 1:
+        add(Step("write", "Taking square root of both sides:"))
+        add(Step("latex", f"{lb1} = 0"))
+    else:
+        add(Step("write", "By zero product property, at least one factor must be zero"))
+
+    add(Step("write", "**Step 8:** Solve for x:"))
+    if len(unique_roots) == 1:
+        add(Step("latex", f"x = {lr1}"))
+    else:
+        add(Step("write", f"**From first factor:** {lb1} = 0"))
+        add(Step("latex", f"x = {lr1}"))
+        add(Step("write", ""))
+        add(Step("write", f"**From second factor:** {lb2} = 0"))
+        add(Step("latex", f"x = {lr2}"))
+
+
+def _method2(s, tex):
+    a, b, c = s.a, s.b, s.c
+    discriminant, unique_roots = s.discriminant, s.unique_roots
+    la, lb, lc, ld = tex(a), tex(b), tex(c), tex(discriminant)
+    steps = []
+    add = steps.append
+
+    add(Step("markdown", "### Solution:"))
+    add(Step("write", "**Step 1:** For the equation"))
+    add(Step("latex", f"{tex(s.equation)} = 0"))
+
+    add(Step("write", "**Step 2:** Use the quadratic formula:"))
+    add(Step("latex", r"x = \frac{-b \pm \sqrt{b^2 - 4ac}}{2a}"))
+
+    add(Step("write", "**Step 3:** Identify the coefficients:"))
+    add(Step("latex", f"a = {la}, \\quad b = {lb}, \\quad c = {lc}"))
+
+    add(Step("write", "**Step 4:** Calculate the discriminant:"))
+    add(Step("latex", "\\Delta = b^2 - 4ac"))
+    add(Step("latex", f"\\Delta = ({lb})^2 - 4({la})({lc})"))
+    add(Step("latex", f"\\Delta = {tex(expand(b**2))} - {tex(4*a*c)}"))
+    add(Step("latex", f"\\Delta = {ld}"))
+
+    add(Step("write", "**Step 5:** Substitute into the formula:"))
+    l_neg_b, l_two_a = tex(-b), tex(2*a)
+    add(Step("latex", f"x = \\frac{{-({lb}) \\pm \\sqrt{{{ld}}}}}{{2({la})}}"))
+    add(Step("latex", f"x = \\frac{{{l_neg_b} \\pm \\sqrt{{{ld}}}}}{{{l_two_a}}}"))
+
+    add(Step("write", "**Step 6:** Calculate the roots:"))
+    # The solver already returns simplified roots in a deterministic order.
+    if discriminant.is_zero:
+        lr = tex(unique_roots[0])
+        add(Step("latex", f"x = \\frac{{{l_neg_b}}}{{{l_two_a}}}"))
+        add(Step("write", "Simplify:"))
+        add(Step("latex", f"x = {lr}"))
+        add(Step("info", "**Note:** Since Δ = 0, there is one repeated root."))
+        add(Step("answer"))
+        add(Step("latex", f"x = {lr} \\text{{ (repeated twice)}}"))
+    else:
+        if discriminant.is_positive and len(unique_roots) >= 2:
+            for i, root in enumerate(unique_roots, 1):
+                add(Step("latex", f"x_{i} = {tex(root)}"))
+        elif discriminant.is_negative:
+            add(Step("write", "The discriminant is negative, so the roots are complex."))
+            for i, root in enumerate(unique_roots, 1):
+                add(Step("latex", f"x_{i} = {tex(root)}"))
+        else:
+            for root in unique_roots:
+                add(Step("latex", f"x = {tex(root)}"))
+        add(Step("answer"))
+        add(Step("latex", ", \\quad ".join([f"x = {tex(r)}" for r in unique_roots])))
+    return tuple(steps)
+
+
+def _verification(s, tex):
+    a, b, c = s.a, s.b, s.c
+    la, lb, lc = tex(a), tex(b), tex(c)
+    steps = []
+    add = steps.append
+
+    for i, root in enumerate(s.unique_roots, 1):
+        lr = tex(root)
+        add(Step("write", f"**Verification for x = {lr}:**"))
+        add(Step("write", "Substituting into the original equation:"))
+
+        term_a = a * root**2
+        term_b = b * root
+        result = _simplified(term_a + term_b + c)
+
+        add(Step("latex", f"{la}({lr})^2 + ({lb})({lr}) + {lc}"))
+        add(Step("latex", f"= {tex(_simplified(term_a))} + {tex(_simplified(term_b))} + {lc}"))
+        add(Step("latex", f"= {tex(result)}"))
+
+        if result == 0:
+            add(Step("success", "✓ Verified! The root satisfies the equation."))
+        if i < len(s.unique_roots):
+            add(Step("divider"))
+    return tuple(steps)
+
+
+SECTIONS = {
+    "method1": _method1,
+    "method2": _method2,
+    "verification": _verification,
+}
+
+
+def answer_latex(solution):
+    """One-line LaTeX summary of the roots, shown before any method."""
+    tex = _LatexCache()
+    if len(solution.unique_roots) == 1:
+        return f"x = {tex(solution.unique_roots[0])} \\text{{ (repeated twice)}}"
+    return ", \\quad ".join([f"x = {tex(r)}" for r in solution.unique_roots])
+
+
+def build_steps(solution):
+    """Build the full three-section step model for a solved quadratic."""
+    tex = _LatexCache()
+    return SolutionSteps(
+        equation_latex=tex(solution.equation),
+        method1=_method1(solution, tex),
+        method2=_method2(solution, tex),
+        verification=_verification(solution, tex),
+    )
+
+
+cache = SolutionCache()
+metrics.register_cache("steps", cache)
+
+
+def get_section(solution, name):
+    """Return the (possibly cached or stored) steps of one section, building only that section.
+
+    Methods the student never opens are never built.
+    """
+    key = canonical_key(solution.a, solution.b, solution.c) + (name,)
+    section = cache.get(key)
+    if section is None:
+        section = results.get(key)
+        if section is None:
+            section = SECTIONS[name](solution, _LatexCache())
+            results.put(key, section)
+        cache.put(key, section)
+    return section
@@ -0,0 +1,289 @@
+"""Persistent result store shared by every worker process on the machine.
+
+The in-process caches in ``solver`` and ``steps`` start empty after every
+redeploy, and each Streamlit worker or API process keeps its own copy.
+This store sits behind them. It is a single SQLite database in WAL mode,
+so any number of processes can read while one writes. Rows are keyed by the
+canonical coefficient triple plus what they hold: ``"solution"`` for
+symbolic solutions (rational ones are recomputed faster than they are
+read), or a step section name for the prebuilt step LaTeX.
+
+Values are pickled. The database is cleared automatically when the solver
+code or the sympy version changes, so stale steps are never served. Total
+payload size is capped. The least recently used rows are evicted first, and
+a row's last-use time is refreshed at most once a minute so that reads
+rarely write.
+
+The store is best effort: database errors are logged and treated as a
+miss. ``SOLVER_STORE_PATH`` sets the file; an empty value disables the
+store.
+
+Warm it up before exam season from a CSV or JSONL problem list in the same
+format as the bulk worksheet upload:
+
+    python store.py warm textbook_problems.csv
+    python store.py stats
+"""
+import argparse
+import hashlib
+import logging
+import os
+import pickle
+import sqlite3
+import sys
+import threading
+import time
+
+import sympy
+
+import metrics
+
+logger = logging.getLogger(__name__)
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_PATH = os.path.join(HERE, ".cache", "results.sqlite3")
+MAX_BYTES = int(float(os.environ.get("SOLVER_STORE_MAX_MB", 256)) * 1024 * 1024)
+TOUCH_INTERVAL = 60.0
+EVICT_EVERY = 100
+# Code whose output is stored: any change to it invalidates the database.
+SOURCES = ("solver.py", "steps.py", "factor_pairs.py", "simplification.py")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS results (
+    key TEXT PRIMARY KEY,
+    value BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    last_used REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS results_last_used ON results (last_used);
+"""
+
+
+def _version():
+    digest = hashlib.sha256(sympy.__version__.encode())
+    for name in SOURCES:
+        try:
+            with open(os.path.join(HERE, name), "rb") as f:
+                digest.update(f.read())
+        except OSError:
+            pass
+    return digest.hexdigest()[:16]
+
+
+class ResultStore:
+    """SQLite-backed key/value store with size-bounded LRU eviction."""
+
+    def __init__(self, path, max_bytes=MAX_BYTES):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._conn = None
+        self._pid = None
+        self._lock = threading.RLock()
+        self._puts = 0
+        self._warned = False
+
+    @property
+    def enabled(self):
+        return bool(self.path)
+
+    def _connect(self):
+        # One connection per process, shared by the script threads under
+        # ``_lock``; a forked child must not reuse its parent's connection.
+        if self._conn is not None and self._pid == os.getpid():
+            return self._conn
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        conn = sqlite3.connect(self.path, timeout=10, isolation_level=None, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.executescript(_SCHEMA)
+        version = _version()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute("SELECT value FROM meta WHERE name = 'version'").fetchone()
+            if row is None or row[0] != version:
+                conn.execute("DELETE FROM results")
+                conn.execute("INSERT OR REPLACE INTO meta VALUES ('version', ?)", (version,))
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        self._conn, self._pid = conn, os.getpid()
+        return conn
+
+    def _fail(self, action, error):
+        if not self._warned:
+            logger.warning("Result store %s failed (%s); treating it as a miss", action, error)
+        self._warned = True
+
+    @staticmethod
+    def _key(key):
+        return "\x1f".join(key)
+
+    def get(self, key):
+        if not self.enabled:
+            return None
+        try:
+            with self._lock:
+                conn = self._connect()
+                row = conn.execute("SELECT value, last_used FROM results WHERE key = ?", (self._key(key),)).fetchone()
+                if row is None:
+                    self.misses += 1
+                    return None
+                value, last_used = row
+                now = time.time()
+                if now - last_used > TOUCH_INTERVAL:
+                    conn.execute("UPDATE results SET last_used = ? WHERE key = ?", (now, self._key(key)))
+                self.hits += 1
+            return pickle.loads(value)
+        except Exception as e:
+            self._fail("read", e)
+            return None
+
+    def put(self, key, value):
+        if not self.enabled:
+            return
+        try:
+            blob = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+            with self._lock:
+                self._connect().execute(
+                    "INSERT OR REPLACE INTO results (key, value, size, last_used) VALUES (?, ?, ?, ?)",
+                    (self._key(key), blob, len(blob), time.time()),
+                )
+                self._puts += 1
+                if self._puts % EVICT_EVERY == 0:
+                    self.evict()
+        except Exception as e:
+            self._fail("write", e)
+
+    def evict(self):
+        """Delete the least recently used rows until the payload fits in ``max_bytes``."""
+        with self._lock:
+            return self._evict(self._connect())
+
+    def _evict(self, conn):
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM results").fetchone()[0]
+            excess = total - self.max_bytes
+            removed = 0
+            if excess > 0:
+                # Free a little more than needed so eviction does not run on every write.
+                excess += self.max_bytes // 10
+                oldest = conn.execute("SELECT key, size FROM results ORDER BY last_used").fetchall()
+                doomed = []
+                for key, size in oldest:
+                    if excess <= 0:
+                        break
+                    doomed.append((key,))
+                    excess -= size
+                conn.executemany("DELETE FROM results WHERE key = ?", doomed)
+                removed = len(doomed)
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        return removed
+
+    def clear(self):
+        with self._lock:
+            self._connect().execute("DELETE FROM results")
+            self.hits = self.misses = 0
+
+    def stats(self):
+        rows = size = 0
+        if self.enabled:
+            try:
+                with self._lock:
+                    rows, size = self._connect().execute(
+                        "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM results"
+                    ).fetchone()
+            except (sqlite3.Error, OSError) as e:
+                self._fail("read", e)
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "size": rows,
+            "bytes": size,
+            "max_bytes": self.max_bytes,
+            "hit_rate": self.hits / total if total else 0.0,
+        }
+
+
+results = ResultStore(os.environ.get("SOLVER_STORE_PATH", DEFAULT_PATH))
+metrics.register_cache("store", results)
+
+
+# ---------- command line ----------
+
+def _warm_one(texts):
+    import governor
+    import steps
+
+    a, b, c = (governor.parse_coefficient(t) for t in texts)
+    solution = governor.solve(a, b, c)
+    for name in steps.SECTIONS:
+        steps.get_section(solution, name)
+
+
+def warm(problems, workers=None):
+    """Solve ``problems`` (text triples) and persist their solutions and steps.
+
+    Returns the number of problems that failed to solve.
+    """
+    from concurrent.futures import ThreadPoolExecutor
+
+    failed = 0
+    start = time.perf_counter()
+    # Symbolic solves run in governor child processes, so threads overlap them.
+    with ThreadPoolExecutor(max_workers=workers or os.cpu_count() or 1) as pool:
+        futures = [pool.submit(_warm_one, texts) for texts in problems]
+        for i, (texts, future) in enumerate(zip(problems, futures), 1):
+            try:
+                future.result()
+            except Exception as e:
+                failed += 1
+                print(f"skipped {', '.join(texts)}: {e}", file=sys.stderr)
+            if i % 100 == 0 or i == len(problems):
+                print(f"warmed {i}/{len(problems)} in {time.perf_counter() - start:.1f}s", file=sys.stderr)
+    results.evict()
+    return failed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Manage the persistent solver result store.")
+    parser.add_argument("--path", default=results.path, help="database file (default: %(default)s)")
+    commands = parser.add_subparsers(dest="command", required=True)
+    warm_parser = commands.add_parser("warm", help="preload solutions and steps from a CSV or JSONL problem list")
+    warm_parser.add_argument("problems", help="file with one a, b, c problem per row")
+    warm_parser.add_argument("--workers", type=int, default=None)
+    commands.add_parser("stats", help="show row count and size")
+    commands.add_parser("evict", help="trim the store to its size limit")
+    commands.add_parser("clear", help="delete every stored result")
+    args = parser.parse_args(argv)
+
+    results.path = args.path
+    if args.command == "warm":
+        from batch import read_problems
+
+        with open(args.problems, "rb") as f:
+            problems = read_problems(f.read(), args.problems)
+        failed = warm(problems, args.workers)
+        print(results.stats())
+        return 1 if failed == len(problems) and problems else 0
+    if args.command == "evict":
+        print(f"evicted {results.evict()} rows")
+    elif args.command == "clear":
+        results.clear()
+    print(results.stats())
+    return 0
+
+
+if __name__ == "__main__":
+    # Go through the importable module so governor and steps share its store.
+    import store
+
+    sys.exit(store.main())